@@ -1,109 +1,530 @@
 import asyncio
-import time
+import json
+import os
+from typing import Awaitable, Callable, Dict, NamedTuple, Optional
 
 import discord
+from discord.channel import _threaded_channel_factory
 
+from classes.lru_cache import LRUCache
+from classes.snapshots import MemberSnapshot, UserSnapshot, snapshot
 from utils.logger import *
 
 MEMBER_UPDATE = 43200  # 12 hours
-CHANNEL_UPDATE = 172800  # 48 hours
+CHANNEL_UPDATE = 1209600  # 14 days, channel and thread events keep entries fresh
+
+# Member and user events need the members intent, with it they keep entries
+# fresh and the TTL only guards against missed events
+MEMBER_EVENT_UPDATE = 604800  # 7 days
+
+# Entry caps per cache, plus a rough byte cap across each (optional env)
+MAX_USERS = int(os.getenv("CACHE_MAX_USERS", 20000))
+MAX_MEMBERS = int(os.getenv("CACHE_MAX_MEMBERS", 50000))
+MAX_CHANNELS = int(os.getenv("CACHE_MAX_CHANNELS", 10000))
+MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", 16 * 1024 * 1024))
+
+# Negative entries, a confirmed NotFound is trusted for longer than a timeout
+NOT_FOUND_TTL = 300  # 5 minutes
+TIMEOUT_TTL = 30
+
+# Cached in place of an object Discord could not return
+MISSING = object()
+
+# Shared L2 in Redis holds the API payloads objects are built from, trimmed to
+# the fields discord.py reads, so restarts and other processes start warm
+L2_PREFIX = "cache"
+L2_WARM_BATCH = 500
+L2_INVALIDATE_DELAY = 1.0  # seconds gateway invalidations collect for per UNLINK
+MEMBER_FIELDS = (
+    "user",
+    "roles",
+    "joined_at",
+    "nick",
+    "avatar",
+    "premium_since",
+    "pending",
+    "flags",
+    "communication_disabled_until",
+)
+USER_FIELDS = (
+    "id",
+    "username",
+    "global_name",
+    "discriminator",
+    "avatar",
+    "public_flags",
+    "bot",
+)
+# Read by the guild channel, thread and DM channel constructors
+CHANNEL_FIELDS = (
+    "id",
+    "type",
+    "guild_id",
+    "name",
+    "parent_id",
+    "topic",
+    "position",
+    "nsfw",
+    "rate_limit_per_user",
+    "default_auto_archive_duration",
+    "default_thread_rate_limit_per_user",
+    "last_message_id",
+    "flags",
+    "permission_overwrites",
+    "bitrate",
+    "user_limit",
+    "rtc_region",
+    "video_quality_mode",
+    "available_tags",
+    "default_reaction_emoji",
+    "default_sort_order",
+    "default_forum_layout",
+    "owner_id",
+    "message_count",
+    "member_count",
+    "applied_tags",
+    "thread_metadata",
+    "member",
+    "recipients",
+    "icon",
+)
+
+
+# Every cache entry is keyed by one of these, built by the helpers below so an
+# ID read from a channel topic or the DB as a string lands on the same entry as
+# the int from a discord object. guild_id is 0 for users and channels
+class CacheKey(NamedTuple):
+    kind: str
+    id: int
+    guild_id: int = 0
+
+
+# Returns an ID as an int, or None if it is not a valid snowflake
+def snowflake(value) -> Optional[int]:
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return None
+    return value if value > 0 else None
+
+
+def user_key(user_id) -> Optional[CacheKey]:
+    user_id = snowflake(user_id)
+    return CacheKey("user", user_id) if user_id else None
+
+
+def member_key(guild_id, member_id) -> Optional[CacheKey]:
+    guild_id, member_id = snowflake(guild_id), snowflake(member_id)
+    if guild_id is None or member_id is None:
+        return None
+    return CacheKey("member", member_id, guild_id)
+
+
+def channel_key(channel_id) -> Optional[CacheKey]:
+    channel_id = snowflake(channel_id)
+    return CacheKey("channel", channel_id) if channel_id else None
+
+
+def l2_key(key: CacheKey) -> str:
+    return f"{L2_PREFIX}:{key.kind}:{key.guild_id}:{key.id}"
+
+
+def compact_user(data: dict) -> dict:
+    return {field: data[field] for field in USER_FIELDS if field in data}
+
+
+def compact_member(data: dict) -> dict:
+    member = {field: data[field] for field in MEMBER_FIELDS if field in data}
+    member["user"] = compact_user(data["user"])
+    return member
+
+
+def compact_channel(data: dict) -> dict:
+    return {field: data[field] for field in CHANNEL_FIELDS if field in data}
 
 
 class Cache:
     def __init__(self, bot):
         self.bot = bot
-        self.user_cache = {}
-        self.member_cache = {}
-        self.channel_cache = {}
+        member_ttl = MEMBER_EVENT_UPDATE if bot.intents.members else MEMBER_UPDATE
+        self.user_cache = LRUCache("users", member_ttl, MAX_USERS, MAX_BYTES)
+        self.member_cache = LRUCache("members", member_ttl, MAX_MEMBERS, MAX_BYTES)
+        self.channel_cache = LRUCache(
+            "channels", CHANNEL_UPDATE, MAX_CHANNELS, MAX_BYTES
+        )
+        self.in_flight: Dict[CacheKey, asyncio.Future] = {}
+        self.coalesced = {}  # {cache name: lookups that joined a running fetch}
+        self.negative_hits = {}  # {cache name: fetches skipped by a MISSING entry}
+        self.event_updates = {}  # {cache name: entries refreshed by gateway events}
+        self.normalised = {}  # {cache name: lookups made with a non-int ID}
+        self.l2_hits = {}  # {cache name: misses answered from Redis}
+        self.l2_stale = set()  # shared keys waiting to be invalidated
+        self.l2_invalidate_task = None
 
-    async def store_user(self, user: discord.User):
-        epoch_time = int(time.time())
-        self.user_cache[user.id] = (user, epoch_time)
+    # Drops expired entries from every cache, run from the bot heartbeat
+    def sweep(self) -> int:
+        return sum(cache.sweep() for cache in self._caches())
 
-    async def get_user(self, user_id: int):
+    def get_stats(self) -> dict:
+        stats = {}
+        for cache in self._caches():
+            stats[cache.name] = cache.get_stats()
+            stats[cache.name]["coalesced"] = self.coalesced.get(cache.name, 0)
+            stats[cache.name]["negative_hits"] = self.negative_hits.get(cache.name, 0)
+            stats[cache.name]["event_updates"] = self.event_updates.get(cache.name, 0)
+            stats[cache.name]["normalised"] = self.normalised.get(cache.name, 0)
+            stats[cache.name]["l2_hits"] = self.l2_hits.get(cache.name, 0)
+        return stats
+
+    # Returns the cached value, MISSING for a remembered miss, or None. Counts
+    # lookups that arrived with a string ID, each of which used to miss
+    def _cached(self, cache: LRUCache, key: CacheKey, raw_id=None):
+        if raw_id is not None and not isinstance(raw_id, int):
+            self.normalised[cache.name] = self.normalised.get(cache.name, 0) + 1
+        value = cache.get(key)
+        if value is MISSING:
+            self.negative_hits[cache.name] = self.negative_hits.get(cache.name, 0) + 1
+        return value
+
+    # Remembers that a fetch found nothing so repeat lookups skip the API for a
+    # while, errors other than NotFound and timeouts are not cached
+    def _remember_miss(self, cache: LRUCache, key: CacheKey, error: Exception):
+        if isinstance(error, discord.NotFound):
+            cache.set(key, MISSING, ttl=NOT_FOUND_TTL)
+        elif isinstance(error, asyncio.TimeoutError):
+            cache.set(key, MISSING, ttl=TIMEOUT_TTL)
+
+    def _count_event(self, cache: LRUCache):
+        self.event_updates[cache.name] = self.event_updates.get(cache.name, 0) + 1
+
+    # Gateway event handlers, called from the Events cog. Updates only touch
+    # entries already cached, so events for unrelated objects cost a set insert.
+    # The shared copy is dropped in batches, other processes may have cached it
+    # and reload it on their next miss
+    async def update_user(self, user: discord.User):
+        key = user_key(user.id)
+        if self.user_cache.replace(key, snapshot(user)):
+            self._count_event(self.user_cache)
+        self._l2_invalidate(key)
+
+    async def update_member(self, member: discord.Member):
+        key = member_key(member.guild.id, member.id)
+        if self.member_cache.replace(key, snapshot(member)):
+            self._count_event(self.member_cache)
+        self._l2_invalidate(key)
+
+    async def update_channel(self, channel: discord.abc.GuildChannel):
+        key = channel_key(channel.id)
+        if self.channel_cache.replace(key, channel):
+            self._count_event(self.channel_cache)
+        self._l2_invalidate(key)
+
+    # Drops a member's entry, e.g. a miss remembered from before they joined
+    async def invalidate_member(self, guild_id: int, member_id: int):
+        key = member_key(guild_id, member_id)
+        if self.member_cache.pop(key) is not None:
+            self._count_event(self.member_cache)
+        self._l2_invalidate(key)
+
+    # Marks a member who left, or a deleted channel, as missing up front
+    async def remove_member(self, guild_id: int, member_id: int):
+        key = member_key(guild_id, member_id)
+        self.member_cache.set(key, MISSING, ttl=NOT_FOUND_TTL)
+        self._count_event(self.member_cache)
+        self._l2_invalidate(key)
+
+    async def remove_channel(self, channel_id: int):
+        key = channel_key(channel_id)
+        self.channel_cache.set(key, MISSING, ttl=NOT_FOUND_TTL)
+        self._count_event(self.channel_cache)
+        self._l2_invalidate(key)
+
+    async def _l2_get(self, key: CacheKey) -> Optional[dict]:
+        redis = self.bot.data_manager.redis
+        if redis is None or l2_key(key) in self.l2_stale:
+            return None  # a stale copy waiting to be dropped is not trusted
         try:
-            user = None
-            epoch = None
+            data = await redis.get(l2_key(key))
+            return json.loads(data) if data else None
+        except Exception as e:
+            logger.warning(f"Shared cache read failed for {key}: {e}")
+            return None
 
-            result = self.user_cache.get(str(user_id), None)
-            if result:
-                user, epoch = result
-                if (int(time.time()) - epoch) <= MEMBER_UPDATE:
-                    return user
+    async def _l2_set(self, key: CacheKey, data: dict, ttl: float):
+        redis = self.bot.data_manager.redis
+        if redis is None:
+            return
+        try:
+            payload = json.dumps(data, separators=(",", ":"))
+            await redis.set(l2_key(key), payload, ex=int(ttl))
+        except Exception as e:
+            logger.warning(f"Shared cache write failed for {key}: {e}")
 
-            else:
-                epoch_time = int(time.time())
+    # Queues a shared entry for deletion, every key queued within
+    # L2_INVALIDATE_DELAY goes out in one UNLINK instead of a round trip each
+    def _l2_invalidate(self, key: CacheKey):
+        if key is None or self.bot.data_manager.redis is None:
+            return
+        self.l2_stale.add(l2_key(key))
+        if self.l2_invalidate_task is None or self.l2_invalidate_task.done():
+            self.l2_invalidate_task = asyncio.create_task(self._l2_flush_stale())
+
+    async def _l2_flush_stale(self):
+        while self.l2_stale:
+            await asyncio.sleep(L2_INVALIDATE_DELAY)
+            stale = list(self.l2_stale)
+            self.l2_stale.clear()
+
+            redis = self.bot.data_manager.redis
+            if redis is None:
+                return
+            for start in range(0, len(stale), L2_WARM_BATCH):
                 try:
-                    user = await asyncio.wait_for(
-                        self.bot.fetch_user(user_id), timeout=2
-                    )
-                except Exception:
-                    return None
-                self.user_cache[str(user.id)] = (user, epoch_time)
+                    await redis.unlink(*stale[start : start + L2_WARM_BATCH])
+                except Exception as e:
+                    logger.warning(f"Shared cache invalidation failed: {e}")
+
+    def _count_l2_hit(self, cache: LRUCache):
+        self.l2_hits[cache.name] = self.l2_hits.get(cache.name, 0) + 1
+
+    # Builders mirror what Client.fetch_user, Guild.fetch_member and
+    # Client.fetch_channel do with the same payloads. Users and members are
+    # cached as snapshots, the full objects are dropped straight away
+    def _build_user(self, data: dict) -> UserSnapshot:
+        user = discord.User(state=self.bot._connection, data=data)
+        return UserSnapshot.from_user(user)
+
+    def _build_member(self, guild: discord.Guild, data: dict) -> MemberSnapshot:
+        member = discord.Member(data=data, guild=guild, state=self.bot._connection)
+        return MemberSnapshot.from_member(member)
+
+    def _build_channel(self, data: dict):
+        factory, channel_type = _threaded_channel_factory(data["type"])
+        if factory is None:
+            return None
+        if channel_type in (discord.ChannelType.group, discord.ChannelType.private):
+            return factory(me=self.bot.user, data=data, state=self.bot._connection)
+
+        guild = self.bot.get_guild(int(data["guild_id"]))
+        if guild is None:
+            return None
+        return factory(guild=guild, state=self.bot._connection, data=data)
+
+    # Loads the channel, log thread and opener of every open ticket from the
+    # shared cache, so the first message after a restart needs no fetches.
+    # Entries missing from Redis are left to load on demand
+    async def warm_up(self) -> int:
+        redis = self.bot.data_manager.redis
+        if redis is None:
+            return 0
+
+        keys = []
+        for guild_id, channel_id, log_id, opener_id in (
+            await self.bot.data_manager.get_open_ticket_links() or []
+        ):
+            keys.append(channel_key(channel_id))
+            keys.append(channel_key(log_id))
+            keys.append(member_key(guild_id, opener_id))
+        keys = [key for key in dict.fromkeys(keys) if key is not None]
+
+        warmed = 0
+        for start in range(0, len(keys), L2_WARM_BATCH):
+            batch = keys[start : start + L2_WARM_BATCH]
+            try:
+                payloads = await redis.mget([l2_key(key) for key in batch])
+            except Exception as e:
+                logger.warning(f"Shared cache warm-up failed: {e}")
+                break
+
+            for key, payload in zip(batch, payloads):
+                if payload is None:
+                    continue
+                try:
+                    warmed += self._warm_entry(key, json.loads(payload))
+                except Exception as e:
+                    logger.warning(f"Could not rebuild cached {key}: {e}")
+
+        logger.success(f"Warmed {warmed} of {len(keys)} open ticket cache entries")
+        return warmed
+
+    def _warm_entry(self, key: CacheKey, data: dict) -> bool:
+        if key.kind == "channel":
+            channel = self._build_channel(data)
+            if channel is None:
+                return False
+            self.channel_cache.set(key, channel)
+            return True
+
+        guild = self.bot.get_guild(key.guild_id)
+        if guild is None:
+            return False
+        self.member_cache.set(key, self._build_member(guild, data))
+        return True
+
+    def _caches(self):
+        return (self.user_cache, self.member_cache, self.channel_cache)
+
+    # Runs fetch once for concurrent misses on the same key, every caller awaits
+    # the same task. The task is shielded so one caller timing out or being
+    # cancelled does not cancel it for the rest
+    async def _single_flight(
+        self, cache: LRUCache, key: CacheKey, fetch: Callable[[], Awaitable]
+    ):
+        flight_key = key
+        task = self.in_flight.get(flight_key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self.in_flight[flight_key] = task
+            task.add_done_callback(lambda done: self._land(flight_key, done))
+        else:
+            self.coalesced[cache.name] = self.coalesced.get(cache.name, 0) + 1
+        return await asyncio.shield(task)
+
+    def _land(self, flight_key: CacheKey, task: asyncio.Future):
+        self.in_flight.pop(flight_key, None)
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every caller went away
+
+    async def store_user(self, user: discord.User):
+        self.user_cache.set(user_key(user.id), snapshot(user))
+
+    async def get_user(self, user_id: int):
+        try:
+            key = user_key(user_id)
+            if key is None:
+                return None
+
+            user = self._cached(self.user_cache, key, user_id)
+            if user is MISSING:
+                return None
+            if user is not None:
                 return user
 
+            try:
+                return await self._single_flight(
+                    self.user_cache, key, lambda: self._fetch_user(key)
+                )
+            except Exception:
+                return None
+
         except Exception as e:
             logger.exception(f"get_user sent an error: {e}")
 
+    async def _fetch_user(self, key: CacheKey) -> UserSnapshot:
+        data = await self._l2_get(key)
+        if data is not None:
+            self._count_l2_hit(self.user_cache)
+        else:
+            try:
+                data = await asyncio.wait_for(
+                    self.bot.http.get_user(key.id), timeout=2
+                )
+            except Exception as e:
+                self._remember_miss(self.user_cache, key, e)
+                raise
+            data = compact_user(data)
+            await self._l2_set(key, data, self.user_cache.ttl)
+
+        user = self._build_user(data)
+        self.user_cache.set(key, user)
+        return user
+
     async def store_guild_member(self, guild_id: int, member: discord.Member):
-        epoch_time = int(time.time())
-        self.member_cache[(member.id, guild_id)] = (member, epoch_time)
+        self.member_cache.set(member_key(guild_id, member.id), snapshot(member))
 
     async def get_guild_member(self, guild: discord.Guild, member_id: int):
         try:
-            member = None
-            epoch = None
+            key = member_key(guild.id, member_id)
+            if key is None:
+                return None
 
-            result = self.member_cache.get((member_id, guild.id), None)
-            if result:
-                member, epoch = result
-                if (int(time.time()) - epoch) <= MEMBER_UPDATE:
-                    return member
+            member = self._cached(self.member_cache, key, member_id)
+            if member is MISSING:
+                return None
+            if member is not None:
+                return member
 
-            epoch_time = int(time.time())
             try:
-                member = await asyncio.wait_for(
-                    guild.fetch_member(member_id), timeout=5
+                return await self._single_flight(
+                    self.member_cache,
+                    key,
+                    lambda: self._fetch_guild_member(guild, key),
                 )
             except Exception as e:
                 logger.error(f"Failed to fetch guild member using id {member_id}: {e}")
                 return None
-            self.member_cache[(member.id, guild.id)] = (member, epoch_time)
-            return member
 
         except Exception as e:
             logger.exception(f"get_guild_member sent an error: {e}")
 
+    async def _fetch_guild_member(
+        self, guild: discord.Guild, key: CacheKey
+    ) -> MemberSnapshot:
+        data = await self._l2_get(key)
+        if data is not None:
+            self._count_l2_hit(self.member_cache)
+        else:
+            try:
+                data = await asyncio.wait_for(
+                    self.bot.http.get_member(guild.id, key.id), timeout=5
+                )
+            except Exception as e:
+                self._remember_miss(self.member_cache, key, e)
+                raise
+            data = compact_member(data)
+            await self._l2_set(key, data, self.member_cache.ttl)
+
+        member = self._build_member(guild, data)
+        self.member_cache.set(key, member)
+        return member
+
     async def store_channel(self, channel: discord.abc.GuildChannel):
-        epoch_time = int(time.time())
-        self.channel_cache[channel.id] = (channel, epoch_time)
+        self.channel_cache.set(channel_key(channel.id), channel)
 
     async def get_channel(self, channel_id: int):
         try:
-            channel = None
-            epoch = None
-
-            result = self.channel_cache.get(channel_id, None)
-            if result is not None:
-                channel, epoch = result
-                if (int(time.time()) - epoch) <= CHANNEL_UPDATE:
-                    return channel
+            key = channel_key(channel_id)
+            if key is None:
+                return None
 
-            epoch_time = int(time.time())
-            channel = self.bot.get_channel(channel_id)
+            channel = self._cached(self.channel_cache, key, channel_id)
+            if channel is MISSING:
+                return None
             if channel is not None:
-                self.channel_cache[channel.id] = (channel, epoch_time)
                 return channel
 
-            else:
-                try:
-                    channel = await asyncio.wait_for(
-                        self.bot.fetch_channel(channel_id), timeout=2
-                    )
-                except Exception as e:
-                    return None
-                self.channel_cache[channel.id] = (channel, epoch_time)
+            channel = self.bot.get_channel(key.id)
+            if channel is not None:
+                self.channel_cache.set(key, channel)
                 return channel
 
+            try:
+                return await self._single_flight(
+                    self.channel_cache, key, lambda: self._fetch_channel(key)
+                )
+            except Exception:
+                return None
+
         except Exception as e:
             logger.exception(f"get_channel sent an error: {e}")
+
+    async def _fetch_channel(self, key: CacheKey):
+        data = await self._l2_get(key)
+        channel = self._build_channel(data) if data is not None else None
+        if channel is not None:
+            self._count_l2_hit(self.channel_cache)
+        else:
+            try:
+                data = await asyncio.wait_for(
+                    self.bot.http.get_channel(key.id), timeout=2
+                )
+            except Exception as e:
+                self._remember_miss(self.channel_cache, key, e)
+                raise
+            channel = self._build_channel(data)
+            if channel is None:
+                raise discord.InvalidData(f"Unknown channel type {data.get('type')}")
+            await self._l2_set(key, compact_channel(data), self.channel_cache.ttl)
+
+        self.channel_cache.set(key, channel)
+        return channel
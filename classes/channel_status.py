@@ -1,4 +1,5 @@
 import asyncio
+import heapq
 import time
 
 import discord
@@ -18,6 +19,8 @@ class ChannelStatus:
         self.channel_status_worker_task = None
         self.timer_worker_task = None
         self.timers = {}  # Stores ticket close timers
+        self.timer_heap = []  # (end_time, channel_id), earliest first
+        self.timer_wakeup = asyncio.Event()
 
     async def start_worker(self):
         try:
@@ -103,69 +106,87 @@ class ChannelStatus:
             except Exception as e:
                 logger.exception(f"Channel worker sent an error: {e}")
 
-    async def _collect_expired_timers(self):
-        now = int(time.time())
-        expired_timers = []
-
-        for channel_id, fields in self.timers.items():
-            end_time, mod_id, opener_id, reason = fields
-            if now >= int(end_time):
-                expired_timers.append((channel_id, mod_id, opener_id, reason))
-
-        return expired_timers
-
-    # Timer worker, handles scheduled name changes
+    # Returns seconds until the earliest live timer (0 if one is due), None when
+    # there are none. Heap entries left behind by removed or replaced timers are
+    # discarded as they surface
+    def _next_timer_delay(self):
+        while self.timer_heap:
+            end_time, channel_id = self.timer_heap[0]
+            fields = self.timers.get(channel_id)
+            if fields is None or fields[0] != end_time:
+                heapq.heappop(self.timer_heap)
+                continue
+            return max(0.0, end_time - time.time())
+        return None
+
+    # Timer worker, sleeps until the next timer is due or the timers change
     async def timer_worker(self):
         while True:
             try:
-                await asyncio.sleep(60)
-
-                expired_timers = await self._collect_expired_timers()
-                for channel_id, mod_id, opener_id, reason in expired_timers:
-
-                    channel = self.bot.get_channel(channel_id)
-                    if not channel:
-                        try:
-                            channel = await asyncio.wait_for(
-                                self.bot.fetch_channel(channel_id), timeout=1
-                            )
-                        except discord.NotFound:
-                            # TODO Mark as closed
-                            # Remove ticket from database
-                            pass
-                        except Exception:
-                            pass
-
-                    if channel:
-                        try:
-                            guild = channel.guild
-                            mod = await self.bot.cache.get_guild_member(guild, mod_id)
-                            await close_ticket(
-                                self.bot,
-                                channel,
-                                mod,
-                                opener_id,
-                                guild.id,
-                                reason,
-                                None,
-                                True,
-                            )
-
-                        except Exception as e:
-                            logger.error(
-                                f"Failed to update channel "
-                                f"{channel.id} after timer expired: {e}"
-                            )
-
-                    self.timers.pop(channel_id, None)
-                    await self.bot.data_manager.save_timers_to_redis()
-                    await asyncio.sleep(2)
+                self.timer_wakeup.clear()
+                delay = self._next_timer_delay()
+                if delay is None or delay > 0:
+                    try:
+                        await asyncio.wait_for(self.timer_wakeup.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                entry = heapq.heappop(self.timer_heap)
+                channel_id = entry[1]
+                due = self.timers[channel_id]
+                end_time, mod_id, opener_id, reason = due
+                try:
+                    await self._expire_timer(channel_id, mod_id, opener_id, reason)
+                    # Unless it was replaced while the ticket was closing
+                    if self.timers.get(channel_id) is due:
+                        await self.remove_timer(channel_id)
+                except Exception:
+                    # Still due, so it is retried after the worker pauses
+                    heapq.heappush(self.timer_heap, entry)
+                    raise
+                await asyncio.sleep(2)
 
             except Exception:
                 await asyncio.sleep(5)
 
+    async def _expire_timer(self, channel_id, mod_id, opener_id, reason):
+        channel = self.bot.get_channel(channel_id)
+        if not channel:
+            try:
+                channel = await asyncio.wait_for(
+                    self.bot.fetch_channel(channel_id), timeout=1
+                )
+            except discord.NotFound:
+                # TODO Mark as closed
+                # Remove ticket from database
+                pass
+            except Exception:
+                pass
+
+        if channel:
+            try:
+                guild = channel.guild
+                mod = await self.bot.cache.get_guild_member(guild, mod_id)
+                await close_ticket(
+                    self.bot,
+                    channel,
+                    mod,
+                    opener_id,
+                    guild.id,
+                    reason,
+                    None,
+                    True,
+                )
+
+            except Exception as e:
+                logger.error(
+                    f"Failed to update channel "
+                    f"{channel.id} after timer expired: {e}"
+                )
+
     # Queues a channel name update, replacing any previous updates for that channel
-    def queue_update(
+    async def queue_update(
         self, channel: discord.TextChannel, new_name: str, manual: bool
     ) -> bool:
         try:
@@ -211,8 +232,8 @@ class ChannelStatus:
                         (emojis.emoji_map.get("close"))[0],
                     )
                 ) and new_name.startswith((emojis.emoji_map.get("alert", ""))[0]):
-                    if self.timers.pop(channel.id, None):
-                        pass
+                    if channel.id in self.timers:
+                        await self.remove_timer(channel.id)
 
             # Queue the update
             self.pending_updates[channel.id] = new_name
@@ -256,7 +277,7 @@ class ChannelStatus:
 
         else:
             if emoji_str is None:
-                self.queue_update(channel, None, manual)
+                await self.queue_update(channel, None, manual)
                 return True
 
             selected_emoji = (emojis.emoji_map.get(emoji_str))[0]
@@ -277,7 +298,7 @@ class ChannelStatus:
                     else f"{emoji_str}{channel.name}"
                 )
 
-        return self.queue_update(channel, new_name, manual)
+        return await self.queue_update(channel, new_name, manual)
 
     # Check if the input is a valid Unicode emoji
     def check_unicode(self, input_emoji: str) -> bool:
@@ -285,14 +306,27 @@ class ChannelStatus:
 
     async def add_timer(self, channel_id, time, mod_id, opener_id, reason):
         self.timers[channel_id] = [time, mod_id, opener_id, reason]
-        await self.bot.data_manager.save_timers_to_redis()
+        heapq.heappush(self.timer_heap, (time, channel_id))
+        self.timer_wakeup.set()
+        await self.bot.data_manager.save_timer(channel_id, self.timers[channel_id])
 
     async def remove_timer(self, channel_id):
         if self.timers.pop(channel_id, None) is not None:
-            await self.bot.data_manager.save_timers_to_redis()
+            # Its heap entry is dropped lazily once it reaches the top
+            self.timer_wakeup.set()
+            await self.bot.data_manager.delete_timer(channel_id)
             return True
         return False
 
+    # Replaces every timer, e.g. after loading them from Redis
+    def set_timers(self, timers):
+        self.timers = timers
+        self.timer_heap = [
+            (fields[0], channel_id) for channel_id, fields in timers.items()
+        ]
+        heapq.heapify(self.timer_heap)
+        self.timer_wakeup.set()
+
     def get_timer(self, channel_id):
         timer = self.timers.get(channel_id, None)
         return timer
@@ -0,0 +1,94 @@
+import time
+
+from utils.logger import *
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+# Fast-fail guard for a flaky dependency. Closed lets every call through, open
+# rejects calls until reset_timeout has passed, half-open lets a single trial
+# call through whose result decides whether to close or re-open
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout=30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0  # consecutive
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.rejected = 0
+        self.transitions = {}  # {"closed->open": count}
+        self.last_transition = None  # (transition, epoch)
+
+    @property
+    def is_open(self) -> bool:
+        return self.state != CLOSED
+
+    def _transition(self, state: str):
+        transition = f"{self.state}->{state}"
+        self.transitions[transition] = self.transitions.get(transition, 0) + 1
+        self.last_transition = (transition, int(time.time()))
+        self.state = state
+
+        if state == OPEN:
+            self.opened_at = time.monotonic()
+            logger.warning(
+                f"{self.name} circuit opened after {self.failures} failures, "
+                f"failing fast for {self.reset_timeout}s"
+            )
+        elif state == CLOSED:
+            logger.success(f"{self.name} circuit closed")
+        else:
+            logger.info(f"{self.name} circuit half-open, sending trial request")
+
+    # Returns True if a call may proceed, moving open -> half-open once the
+    # reset timeout has passed
+    def allow_request(self) -> bool:
+        if self.state == CLOSED:
+            return True
+
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                return False
+            self._transition(HALF_OPEN)
+
+        # Half-open, only one trial at a time
+        if self.trial_in_flight:
+            self.rejected += 1
+            return False
+        self.trial_in_flight = True
+        return True
+
+    def record_success(self):
+        self.failures = 0
+        self.trial_in_flight = False
+        if self.state != CLOSED:
+            self._transition(CLOSED)
+
+    def record_failure(self):
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.state == HALF_OPEN or (
+            self.state == CLOSED and self.failures >= self.failure_threshold
+        ):
+            self._transition(OPEN)
+
+    # Settles a call that ended with neither outcome, e.g. one cancelled while
+    # waiting. A half-open trial counts as failed, otherwise the circuit would
+    # reject every call while waiting for a result that never comes
+    def record_abandoned(self):
+        if self.state == HALF_OPEN and self.trial_in_flight:
+            self.record_failure()
+
+    def get_metrics(self) -> dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "transitions": dict(self.transitions),
+            "last_transition": self.last_transition,
+        }
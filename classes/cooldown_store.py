@@ -0,0 +1,108 @@
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+MAX_ENTRIES = int(os.getenv("COOLDOWN_MAX_ENTRIES", 100_000))
+WHEEL_GRANULARITY = 1.0  # seconds per expiry slot
+
+# Past this many base delays since a user's last allowed action their backoff
+# resets, so their record carries no information and can be dropped
+RESET_AFTER = 4
+
+
+class CooldownRecord:
+    __slots__ = ("attempts", "last_time", "expires_at", "notified")
+
+    def __init__(self, attempts: int, last_time: float, expires_at: float):
+        self.attempts = attempts
+        self.last_time = last_time
+        self.expires_at = expires_at
+        self.notified = False
+
+
+# Per-user exponential backoff for one action. Records are filed into a time
+# wheel of one-second expiry slots and swept on access, so only users active
+# within the backoff window are held, capped at max_entries
+class CooldownStore:
+    def __init__(self, base_delay: float, max_entries: int = MAX_ENTRIES):
+        self.base_delay = base_delay
+        self.max_entries = max_entries
+        self.records: Dict[int, CooldownRecord] = {}
+        self.wheel: Dict[int, List[int]] = {}  # expiry slot -> user IDs
+        self.high_water = 0  # most records since the dict was last rebuilt
+        self.expired = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _slot(self, timestamp: float) -> int:
+        return int(timestamp // WHEEL_GRANULARITY)
+
+    # Drops every user in a slot whose record still expires in it, records
+    # refreshed since were filed into a later slot as well
+    def _drop_slot(self, slot: int) -> int:
+        dropped = 0
+        for user_id in self.wheel.pop(slot, ()):
+            record = self.records.get(user_id)
+            if record is not None and self._slot(record.expires_at) == slot:
+                del self.records[user_id]
+                dropped += 1
+        return dropped
+
+    # Slots only span the backoff window, so there are never more than a few
+    # dozen to look at
+    def _sweep(self, now: float):
+        current = self._slot(now)
+        for slot in [slot for slot in self.wheel if slot < current]:
+            self.expired += self._drop_slot(slot)
+
+        # Over the cap, forget the users closest to expiring anyway
+        while len(self.records) > self.max_entries and self.wheel:
+            self.evicted += self._drop_slot(min(self.wheel))
+
+        # Dicts never shrink on delete, rebuild once a burst has drained away
+        size = len(self.records)
+        if self.high_water > 4 * size and self.high_water > 1024:
+            self.records = dict(self.records)
+            self.high_water = size
+
+    def check(
+        self, user_id: int, now: Optional[float] = None
+    ) -> Tuple[bool, float, bool]:
+        now = time.monotonic() if now is None else now
+        self._sweep(now)
+
+        record = self.records.get(user_id)
+        if record is not None:
+            delay = self.base_delay * (2 ** max(0, record.attempts - 1))
+            retry_after = record.last_time + delay - now
+            if retry_after > 0:
+                return True, retry_after, record.notified
+
+        # Backoff grows until the reset window has passed without an attempt
+        if record is None or now - record.last_time > self.base_delay * RESET_AFTER:
+            attempts = 1
+        else:
+            attempts = record.attempts + 1
+
+        window = self.base_delay * max(RESET_AFTER, 2 ** (attempts - 1))
+        expires_at = now + window
+        self.records[user_id] = CooldownRecord(attempts, now, expires_at)
+        self.high_water = max(self.high_water, len(self.records))
+        self.wheel.setdefault(self._slot(expires_at), []).append(user_id)
+        return False, 0.0, False
+
+    # Marks the user as told about their cooldown until their next allowed action
+    def mark_notified(self, user_id: int):
+        record = self.records.get(user_id)
+        if record is not None:
+            record.notified = True
+
+    def get_metrics(self) -> dict:
+        return {
+            "entries": len(self.records),
+            "slots": len(self.wheel),
+            "expired": self.expired,
+            "evicted": self.evicted,
+        }
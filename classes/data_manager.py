@@ -1,7 +1,9 @@
 import asyncio
 import json
 import os
+import socket
 import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from typing import Dict, List
 
@@ -10,6 +12,10 @@ import redis.asyncio as redis
 from dotenv import load_dotenv
 from tenacity import retry, stop_after_attempt, wait_random_exponential
 
+from classes.circuit_breaker import CircuitBreaker
+from classes.error_handler import DBAcquireTimeoutError, DBUnavailableError
+from classes.query_stats import QueryStats
+from utils import statements
 from utils.logger import *
 
 load_dotenv()
@@ -18,14 +24,111 @@ db_password = os.getenv("DB_PASSWORD")
 db_name = os.getenv("DB_NAME")
 db_host = os.getenv("DB_HOST")
 redis_url = os.getenv("REDIS_URL")
+db_pool_min = int(os.getenv("DB_POOL_MIN", 2))
+db_pool_max = int(os.getenv("DB_POOL_MAX", 10))
+db_pool_recycle = int(os.getenv("DB_POOL_RECYCLE", 3600))  # seconds, -1 disables
+db_acquire_timeout = float(os.getenv("DB_ACQUIRE_TIMEOUT", 5))  # seconds
+db_breaker_threshold = int(os.getenv("DB_BREAKER_THRESHOLD", 5))
+db_breaker_reset = float(os.getenv("DB_BREAKER_RESET", 30))  # seconds
 
 REDIS_TTL = 60 * 60 * 12  # 12 hours
 
+# MySQL client errors for a connection that could not be made or was lost:
+# can't connect (2002, 2003), server has gone away (2006), lost connection
+# during a query (2013)
+CONNECTION_ERROR_CODES = (2002, 2003, 2006, 2013)
+
+
+# Whether an error means MySQL itself is unreachable, which counts towards
+# tripping the circuit breaker. Anything else (bad SQL, constraint violations,
+# deadlocks, lock wait and query timeouts) is a healthy server under load
+def is_db_outage(error: Exception) -> bool:
+    if isinstance(error, DBAcquireTimeoutError):
+        return True
+    if isinstance(error, asyncio.TimeoutError):
+        return False
+    if isinstance(error, aiomysql.OperationalError):
+        return bool(error.args) and error.args[0] in CONNECTION_ERROR_CODES
+    return isinstance(error, (aiomysql.InterfaceError, OSError))
+
+
+# Upper bounds (ms) of the pool acquire-wait histogram buckets
+ACQUIRE_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000, float("inf"))
+
+# Background message flusher tuning
+FLUSH_BATCH_SIZE = int(os.getenv("FLUSH_BATCH_SIZE", 20))  # wake the flusher early
+FLUSH_MAX_LATENCY = float(os.getenv("FLUSH_MAX_LATENCY", 30))  # seconds between flushes
+FLUSH_MAX_PENDING = int(os.getenv("FLUSH_MAX_PENDING", 500))  # producers wait past this
+FLUSH_MAX_WAIT = float(os.getenv("FLUSH_MAX_WAIT", 2))  # longest a producer waits
+
+# Index sets maintained alongside the per-ticket and per-message keys, so hot
+# paths never have to walk the keyspace with KEYS
+TICKETS_INDEX = "index:tickets"  # set of open ticket channel IDs
+MODMAIL_INDEX = "index:modmail_tickets"  # hash of modmail_log_id -> channel ID
+MESSAGES_INDEX = "index:ticket_messages"  # set of buffered message IDs
+MESSAGES_V2_INDEX = "index:ticket_messages_v2"  # legacy v2 hash buffer index
+INDEX_BACKFILL_DONE = "index:backfilled"  # set once keys from before the indexes
+SCAN_COUNT = 500
+
+# Ticket inactivity timers, saved one at a time as they are set and removed
+TIMERS_DUE = "timers:due"  # sorted set of channel IDs scored by end time
+TIMERS_DATA = "timers:data"  # hash of channel ID -> [mod_id, opener_id, reason]
+
+# v2 message events are appended to a stream and consumed by a consumer group,
+# unacknowledged entries survive restarts and are re-delivered or claimed
+MESSAGES_V2_STREAM = "stream:ticket_messages_v2"
+MESSAGES_V2_GROUP = "flushers"
+STREAM_CONSUMER = os.getenv("STREAM_CONSUMER") or socket.gethostname()
+STREAM_READ_COUNT = 500  # entries per XREADGROUP / XAUTOCLAIM call
+STREAM_CLAIM_IDLE = 60 * 1000  # ms before another consumer's entries are claimed
+
+# Swaps a message buffer and reads it server-side in one round trip. The live
+# index set (KEYS[1]) is merged into the draining set (KEYS[2]) and emptied, so
+# new writes land in a fresh buffer while the old one drains. A draining set
+# left behind by a failed flush is picked up again. The per-message hash prefix
+# is ARGV[1]. Returns a flat list of [message_id, [field, value, ...], ...]
+READ_BUFFER_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('SUNIONSTORE', KEYS[2], KEYS[2], KEYS[1])
+    redis.call('DEL', KEYS[1])
+end
+local ids = redis.call('SMEMBERS', KEYS[2])
+local out = {}
+for _, id in ipairs(ids) do
+    out[#out + 1] = id
+    out[#out + 1] = redis.call('HGETALL', ARGV[1] .. id)
+end
+return out
+"""
+
+# Deletes a drained buffer (KEYS[2]) and its message hashes, skipping any
+# message re-written into the live buffer (KEYS[1]) while the drain ran
+CLEAR_BUFFER_LUA = """
+local ids = redis.call('SMEMBERS', KEYS[2])
+for _, id in ipairs(ids) do
+    if redis.call('SISMEMBER', KEYS[1], id) == 0 then
+        redis.call('DEL', ARGV[1] .. id)
+    end
+end
+redis.call('DEL', KEYS[2])
+return #ids
+"""
+
 
 class DataManager:
     def __init__(self, bot):
         self.bot = bot
         self.db_pool = None
+        self.query_stats = QueryStats()
+        self.db_breaker = CircuitBreaker(
+            "Database", db_breaker_threshold, db_breaker_reset
+        )
+        self.pool_metrics = {
+            "acquires": 0,
+            "acquire_wait_max": 0.0,
+            "acquire_buckets": {bound: 0 for bound in ACQUIRE_BUCKETS},
+            "in_use_peak": 0,
+        }
         self.access_roles = []  # TODO: switch uses to redis
         self.monitored_channels = []  # TODO: remove with Mantid
         self.mod_ids = {}  # TODO: remove with Mantid
@@ -33,7 +136,25 @@ class DataManager:
         self.redis = None
         self.ticket_count = 0
         self.ticket_count_v2 = 0
-        self.flush_lock = asyncio.Lock()
+        # One flush pipeline per table, so a slow v1 flush never stalls v2
+        self.flush_locks = {
+            "ticket_messages": asyncio.Lock(),
+            "ticket_messages_v2": asyncio.Lock(),
+        }
+        self.flush_metrics = {
+            table: {"flushes": 0, "lock_wait_total": 0.0, "lock_wait_max": 0.0}
+            for table in self.flush_locks
+        }
+        self.read_buffer_script = None
+        self.clear_buffer_script = None
+        self.flush_batch_size = FLUSH_BATCH_SIZE
+        self.flush_max_latency = FLUSH_MAX_LATENCY
+        self.flush_max_pending = FLUSH_MAX_PENDING
+        self.flush_max_wait = FLUSH_MAX_WAIT
+        self.flush_event = asyncio.Event()  # set when a batch is ready
+        self.drained_event = asyncio.Event()  # set once pending drops below the cap
+        self.flush_healthy = True  # False while the last flush failed
+        self.flush_worker_task = None
 
     async def log_retry(retry_state):
         logger.warning(
@@ -62,8 +183,14 @@ class DataManager:
                     host=db_host,
                     port=25060,
                     autocommit=True,
+                    minsize=db_pool_min,
+                    maxsize=db_pool_max,
+                    pool_recycle=db_pool_recycle,
+                )
+                logger.success(
+                    f"Database connection established "
+                    f"(pool {db_pool_min}-{db_pool_max}, recycle {db_pool_recycle}s)"
                 )
-                logger.success("Database connection established")
 
             except Exception as e:
                 logger.exception(f"Error connecting to database: {e}")
@@ -81,12 +208,64 @@ class DataManager:
             except Exception as e:
                 logger.error(f"Error closing database connection pool: {e}")
 
+    # Opens and pings minsize connections up front so the first burst of
+    # queries after startup does not pay for connection setup
+    async def warm_db_pool(self):
+        if self.db_pool is None:
+            return
+
+        async def warm_one():
+            async with self.db_pool.acquire() as conn:
+                await conn.ping()
+
+        try:
+            await asyncio.gather(*(warm_one() for _ in range(self.db_pool.minsize)))
+            logger.debug(f"Database pool warmed with {self.db_pool.size} connections")
+
+        except Exception as e:
+            logger.error(f"Error warming database pool: {e}")
+
+    # Records how long one pool acquire waited, and the pool's in-use count
+    def _record_acquire(self, waited: float):
+        waited_ms = waited * 1000
+        metrics = self.pool_metrics
+        metrics["acquires"] += 1
+        metrics["acquire_wait_max"] = max(metrics["acquire_wait_max"], waited_ms)
+        for bound in ACQUIRE_BUCKETS:
+            if waited_ms <= bound:
+                metrics["acquire_buckets"][bound] += 1
+                break
+
+        in_use = self.db_pool.size - self.db_pool.freesize
+        metrics["in_use_peak"] = max(metrics["in_use_peak"], in_use)
+
+    # Returns pool sizing and acquire-wait metrics, used by the heartbeat
+    def get_pool_metrics(self) -> dict:
+        if self.db_pool is None:
+            return {}
+
+        return {
+            "size": self.db_pool.size,
+            "in_use": self.db_pool.size - self.db_pool.freesize,
+            "minsize": self.db_pool.minsize,
+            "maxsize": self.db_pool.maxsize,
+            **self.pool_metrics,
+        }
+
+    # Waits at most db_acquire_timeout for a pooled connection
+    async def _acquire_connection(self):
+        try:
+            return await asyncio.wait_for(
+                self.db_pool.acquire(), timeout=db_acquire_timeout
+            )
+        except asyncio.TimeoutError:
+            raise DBAcquireTimeoutError(
+                f"No database connection free after {db_acquire_timeout}s"
+            ) from None
+
     # mySQL query executor
-    @retry(
-        wait=wait_random_exponential(multiplier=4, min=2, max=20),
-        stop=stop_after_attempt(3),
-        before_sleep=log_retry,
-    )
+    # Guarded by a circuit breaker instead of retries, while MySQL is down calls
+    # fail immediately with DBUnavailableError rather than queueing up
     async def execute_query(
         self,
         query: str,
@@ -95,7 +274,12 @@ class DataManager:
         content=None,
     ):
         result = None
+        conn = None
         timeout = 6
+        settled = False
+
+        if not self.db_breaker.allow_request():
+            raise DBUnavailableError("Database circuit is open, failing fast")
 
         try:
             # Check if connection pool exists (again)
@@ -103,64 +287,103 @@ class DataManager:
                 logger.warning("Connection pool not found: Reconnecting...")
                 await self.connect_to_db()
 
-            conn = await self.db_pool.acquire()
+            acquire_start = time.perf_counter()
+            conn = await self._acquire_connection()
 
             if conn is None:
                 logger.warning("Connection not acquired from pool: Reconnecting...")
                 await self.connect_to_db()
-                conn = await self.db_pool.acquire()
+                conn = await self._acquire_connection()
+            self._record_acquire(time.perf_counter() - acquire_start)
 
             async with conn.cursor() as cursor:
-                if execute_many:
-                    if not content or not isinstance(content, list):
-                        raise ValueError(
-                            "Content for 'execute_many' must be a list of tuples"
-                        )
+                query_start = time.perf_counter()
+                timed_out = False
+                failed = False
+                try:
+                    if execute_many:
+                        if not content or not isinstance(content, list):
+                            raise ValueError(
+                                "Content for 'execute_many' must be a list of tuples"
+                            )
 
-                    # Begin a transaction
-                    await conn.begin()
-                    try:
-                        await asyncio.wait_for(
-                            cursor.executemany(query, content), timeout=timeout
-                        )
-                        await conn.commit()
+                        # Begin a transaction
+                        await conn.begin()
+                        try:
+                            await asyncio.wait_for(
+                                cursor.executemany(query, content), timeout=timeout
+                            )
+                            await conn.commit()
 
-                    except asyncio.TimeoutError:
-                        await conn.rollback()
-                        logger.error(
-                            f"Transaction execution timed out after {timeout} seconds"
-                        )
-                        raise
-
-                    except Exception as e:
-                        await conn.rollback()
-                        logger.error(f"Error during transaction: {e}")
-                        raise
-                else:
-                    try:
-                        await asyncio.wait_for(
-                            cursor.execute(query, content), timeout=timeout
-                        )
+                        except asyncio.TimeoutError:
+                            await conn.rollback()
+                            logger.error(
+                                f"Transaction execution timed out after "
+                                f"{timeout} seconds"
+                            )
+                            raise
+
+                        except Exception as e:
+                            await conn.rollback()
+                            logger.error(f"Error during transaction: {e}")
+                            raise
+                    else:
+                        try:
+                            await asyncio.wait_for(
+                                cursor.execute(query, content), timeout=timeout
+                            )
 
-                    except asyncio.TimeoutError:
-                        await conn.rollback()
-                        logger.error(
-                            f"Query execution timed out after {timeout} seconds"
-                        )
-                        raise
+                        except asyncio.TimeoutError:
+                            await conn.rollback()
+                            logger.error(
+                                f"Query execution timed out after {timeout} seconds"
+                            )
+                            raise
+
+                        except Exception as e:
+                            logger.error(f"Error during query: {e}")
+                            raise
+
+                        if fetch_results:
+                            result = await cursor.fetchall()
 
-                    except Exception as e:
-                        logger.error(f"Error during query: {e}")
-                        raise
+                except asyncio.TimeoutError:
+                    timed_out = True
+                    raise
 
-                    if fetch_results:
-                        result = await cursor.fetchall()
+                except Exception:
+                    failed = True
+                    raise
+
+                finally:
+                    rows = len(result) if result is not None else cursor.rowcount
+                    self.query_stats.record(
+                        query,
+                        time.perf_counter() - query_start,
+                        rows,
+                        timed_out,
+                        failed,
+                    )
 
         except Exception as e:
-            logger.error(f"Unhandled error during query execution: {e}")
+            settled = True
+            if is_db_outage(e):
+                self.db_breaker.record_failure()
+                logger.error(f"Database unavailable during query execution: {e}")
+            else:
+                self.db_breaker.record_success()
+                logger.error(f"Unhandled error during query execution: {e}")
             raise
 
+        else:
+            settled = True
+            self.db_breaker.record_success()
+
         finally:
+            # Cancelled (not an Exception), a half-open trial still has to settle
+            if not settled:
+                self.db_breaker.record_abandoned()
+
             if conn is not None:
                 try:
                     self.db_pool.release(conn)
@@ -169,10 +392,19 @@ class DataManager:
                     logger.exception(f"Failed to release connection: {e}")
         return result
 
+    # Runs a registered statement with its parameters bound by the driver
+    async def execute_statement(self, statement: statements.Statement, *params):
+        return await self.execute_query(
+            statement.sql, statement.fetch, False, params or None
+        )
+
     async def data_startup(self):
+        await self.warm_db_pool()
         await self.update_cache()
         # Connect to redis
         await self.connect_to_redis()
+        await self.backfill_indexes()
+        await self.ensure_message_stream()
 
         # Pull DB data, send to redis
         # FIXME change these to expire after 5 min
@@ -183,9 +415,11 @@ class DataManager:
         # # NOTE this one stays, for mantid
         # await self.load_mods_from_redis()
         await self.bot.channel_status.start_worker()
+        await self.start_flush_worker()
 
     async def data_shutdown(self):
         await self.bot.channel_status.shutdown()
+        await self.stop_flush_worker()
         # await self.save_status_dicts_to_redis()
         # await self.save_timers_to_redis()
         # await self.save_mods_to_redis()
@@ -196,170 +430,109 @@ class DataManager:
     # Handles locally stored and redis caches
     async def update_cache(self, opt: int = 5):
         if opt in (0, 5):
-            query = "SELECT * FROM permissions;"
-            self.access_roles = await self.execute_query(query)
+            self.access_roles = await self.execute_statement(
+                statements.LOAD_ACCESS_ROLES
+            )
             logger.debug("'access_roles' cache updated from database")
 
         if opt in (1, 5):
-            query = "SELECT * FROM channel_monitor;"
-            self.monitored_channels = await self.execute_query(query)
+            self.monitored_channels = await self.execute_statement(
+                statements.LOAD_MONITORED_CHANNELS
+            )
             logger.debug("'monitored_channels' cache updated from database")
 
     # Load server config from the database
     async def load_config_from_db(self, guild_id):
-        query = f"""
-            SELECT * FROM config
-            WHERE guildID = {guild_id};"""
-        data = await self.execute_query(query)
+        data = await self.execute_statement(statements.LOAD_CONFIG, guild_id)
         return data
 
     # Add base config (guild + channels)
     async def add_config_to_db(
         self, guild_id, log_id, inbox_id, responses_id, feedback_id, report_id
     ):
-        query = """
-            INSERT INTO config (guildID, logID, inboxID, responsesID, feedbackID, reportID) 
-            VALUES (%s, %s, %s, %s, %s, %s);
-            """
-        params = (guild_id, log_id, inbox_id, responses_id, feedback_id, report_id)
-        await self.execute_query(query, False, False, params)
+        await self.execute_statement(
+            statements.ADD_CONFIG,
+            guild_id,
+            log_id,
+            inbox_id,
+            responses_id,
+            feedback_id,
+            report_id,
+        )
 
     # get or load config to use config data
     # run database queries, re-load full config from DB (arguably easier)
 
     async def set_ticket_log(self, guild_id, channel_id):
-        query = f"""
-            UPDATE config
-            SET logID = {channel_id}
-            WHERE guildID = {guild_id};
-        """
-        await self.execute_query(query, False)
+        await self.execute_statement(statements.SET_TICKET_LOG, channel_id, guild_id)
 
     async def set_ticket_inbox(self, guild_id, category_id):
-        query = f"""
-            UPDATE config
-            SET inboxID = {category_id}
-            WHERE guildID = {guild_id};
-        """
-        await self.execute_query(query, False)
+        await self.execute_statement(
+            statements.SET_TICKET_INBOX, category_id, guild_id
+        )
 
     async def set_ticket_responses(self, guild_id, channel_id):
-        query = f"""
-            UPDATE config
-            SET responsesID = {channel_id}
-            WHERE guildID = {guild_id};
-        """
-        await self.execute_query(query, False)
+        await self.execute_statement(
+            statements.SET_TICKET_RESPONSES, channel_id, guild_id
+        )
 
     async def set_feedback_thread(self, guild_id, thread_id):
-        query = f"""
-            UPDATE config
-            SET feedbackID = {thread_id}
-            WHERE guildID = {guild_id};
-        """
-        await self.execute_query(query, False)
+        await self.execute_statement(
+            statements.SET_FEEDBACK_THREAD, thread_id, guild_id
+        )
 
     async def set_report_thread(self, guild_id, thread_id):
-        query = f"""
-            UPDATE config
-            SET reportID = {thread_id}
-            WHERE guildID = {guild_id};
-        """
-        await self.execute_query(query, False)
+        await self.execute_statement(statements.SET_REPORT_THREAD, thread_id, guild_id)
 
     # edit config calls
     async def set_anon_status(self, guild_id, anon):
-        query = f"""
-            UPDATE config
-            SET anon = '{anon}'
-            WHERE guildID = {guild_id};
-        """
-        await self.execute_query(query, False)
+        await self.execute_statement(statements.SET_ANON_STATUS, str(anon), guild_id)
 
     async def set_ticket_accepting(self, guild_id, accepting):
-        query = f"""
-            UPDATE config
-            SET accepting = '{accepting}'
-            WHERE guildID = {guild_id};
-        """
-        await self.execute_query(query, False)
+        await self.execute_statement(
+            statements.SET_TICKET_ACCEPTING, str(accepting), guild_id
+        )
 
     async def set_greeting(self, guild_id, greeting):
-        query = f"""
-            UPDATE config
-            SET greeting = %s
-            WHERE guildID = {guild_id};
-            """
-        params = greeting
-        await self.execute_query(query, False, False, params)
+        await self.execute_statement(statements.SET_GREETING, greeting, guild_id)
 
     async def set_closing(self, guild_id, closing):
-        query = f"""
-            UPDATE config
-            SET closing = %s
-            WHERE guildID = {guild_id};
-            """
-        params = closing
-        await self.execute_query(query, False, False, params)
+        await self.execute_statement(statements.SET_CLOSING, closing, guild_id)
 
     # Get all open tickets from database per user
     async def load_tickets_from_db(self, user_id):
-        query = f"""
-            SELECT guildID, channelID 
-            FROM tickets_v2
-            WHERE openerID = {user_id}
-            AND state = 'open';
-            """
-        open_tickets = await self.execute_query(query)
+        open_tickets = await self.execute_statement(
+            statements.LOAD_OPEN_TICKETS, user_id
+        )
         return open_tickets
 
+    async def get_open_ticket_links(self):
+        return await self.execute_statement(statements.LIST_OPEN_TICKET_LINKS)
+
     async def get_guild_and_log(self, channel_id):
-        query = f"""
-            SELECT guildID, logID
-            FROM tickets_v2
-            WHERE channelID = {channel_id};
-            """
-        result = await self.execute_query(query)
+        result = await self.execute_statement(statements.GET_GUILD_AND_LOG, channel_id)
         return result
 
     async def get_ticket_history(self, guild_id, user_id):
-        query = f"""
-            SELECT ticketID, logID, dateOpen, dateClose, closerID, state, typeName 
-            FROM tickets_v2 INNER JOIN ticket_types ON tickets_v2.type = ticket_types.typeID
-            WHERE tickets_v2.guildID = {guild_id}
-            AND tickets_v2.openerID = {user_id}
-            ORDER BY dateOpen Desc;
-            """
-        history = await self.execute_query(query)
+        history = await self.execute_statement(
+            statements.GET_TICKET_HISTORY, guild_id, user_id
+        )
         return history
 
     async def get_ticket_count(self, guild_id, user_id):
-        query = f"""
-            SELECT COUNT(ticketID)
-            FROM tickets_v2
-            WHERE tickets_v2.guildID = {guild_id}
-            AND tickets_v2.openerID = {user_id};
-            """
-        count = await self.execute_query(query)
+        count = await self.execute_statement(
+            statements.GET_TICKET_COUNT, guild_id, user_id
+        )
         return count
 
     async def check_ID_exists(self, ticket_id, guild_id):
-        query = f"""
-            SELECT openerID
-            FROM tickets_v2
-            WHERE tickets_v2.ticketID = {ticket_id}
-            AND tickets_v2.guildID = {guild_id};
-            """
-        id = await self.execute_query(query)
+        id = await self.execute_statement(
+            statements.CHECK_ID_EXISTS, ticket_id, guild_id
+        )
         return id
 
     async def get_ticket_ID(self, channel_id):
-        query = f"""
-            SELECT ticketID
-            FROM tickets_v2
-            WHERE tickets_v2.channelID = {channel_id};
-            """
-        id = await self.execute_query(query)
+        id = await self.execute_statement(statements.GET_TICKET_ID, channel_id)
         return id
 
     # Create a new ticket entry in the database
@@ -379,47 +552,53 @@ class DataManager:
         timestamp = datetime.now(timezone.utc)
         dateOpen = timestamp.strftime("%Y-%m-%d %H:%M:%S")
 
-        query = f"""
-            INSERT IGNORE INTO tickets_v2 (guildID, ticketID, channelID, logID, 
-            dateOpen, openerID, state, type, time, robux, hours, queue) VALUES
-            ({guild_id},
-            {ticket_id},
-            {channel_id},
-            {thread_id},
-            '{dateOpen}',
-            {member_id},
-            'open',
-            {type_id},
-            {time_taken},
-            {robux},
-            {hours},
-            {queue});
-            """
-        await self.execute_query(query, False)
+        await self.execute_statement(
+            statements.CREATE_TICKET,
+            guild_id,
+            ticket_id,
+            channel_id,
+            thread_id,
+            dateOpen,
+            member_id,
+            type_id,
+            time_taken,
+            robux,
+            hours,
+            queue,
+        )
 
     # Update an open database entry as closed
     async def close_ticket(self, channel_id, close_id, close_username):
         timestamp = datetime.now(timezone.utc)
         dateClose = timestamp.strftime("%Y-%m-%d %H:%M:%S")
 
-        query = f"""
-            UPDATE tickets_v2
-            SET dateClose = '{dateClose}',
-                closerID = {close_id},
-                closerUN = '{close_username}',
-                state = 'closed'
-            WHERE channelID = {channel_id};
-            """
-        await self.execute_query(query, False)
+        await self.execute_statement(
+            statements.CLOSE_TICKET, dateClose, close_id, close_username, channel_id
+        )
+
+    # Closes a ticket and reads its duration and first response time (minutes,
+    # None if unknown). Buffered v2 messages are flushed first so the first
+    # response is counted. Only the close itself can fail, the read is
+    # best-effort so analytics trouble never leaves a ticket open. The read
+    # depends on the close, so the two run one after the other
+    async def close_ticket_bundle(self, channel_id, close_id, close_username):
+        await self.flush_messages_v2()
+        await self.close_ticket(channel_id, close_id, close_username)
+
+        try:
+            times = await self.execute_statement(
+                statements.CLOSING_TIMES, channel_id, channel_id
+            )
+        except Exception as e:
+            logger.warning(f"Could not read closing times for {channel_id}: {e}")
+            return None, None
+
+        if not times:
+            return None, None
+        return times[0]
 
     async def update_rating(self, channel_id, rating):
-        query = f"""
-            UPDATE tickets_v2
-            SET rating = %s
-            WHERE channelID = {channel_id};
-            """
-        params = (rating,)
-        await self.execute_query(query, False, False, params)
+        await self.execute_statement(statements.UPDATE_RATING, rating, channel_id)
 
     # Add note to user / ticket
     # async def add_ticket_note(self, user_id, token):
@@ -433,116 +612,74 @@ class DataManager:
 
     # Load all ajectives
     async def load_adjs_from_db(self):
-        query = f"""
-            SELECT * FROM ap_adjs;"""
-        adjs = await self.execute_query(query)
+        adjs = await self.execute_statement(statements.LOAD_ADJS)
         return adjs
 
     # Load all of a guild's ap options
     async def load_nouns_from_db(self, guild_id):
-        query = f"""
-            SELECT ap_nouns.nounID, ap_nouns.noun FROM
-            ap_nouns WHERE ap_nouns.guildID = {guild_id};"""
-        nouns = await self.execute_query(query)
+        nouns = await self.execute_statement(statements.LOAD_NOUNS, guild_id)
         return nouns
 
     # Load all of a guild's ap options
     async def load_links_from_db(self, guild_id):
-        query = f"""
-            SELECT ap_links.modID, ap_links.nounID, ap_links.adjID FROM
-            ap_links WHERE ap_links.guildID = {guild_id};"""
-        links = await self.execute_query(query)
+        links = await self.execute_statement(statements.LOAD_LINKS, guild_id)
         return links
 
     # Load specific AP from the database
     async def load_ap_from_db(self, guild_id, user_id):
-        query = f"""
-            SELECT ap_adjs.adj, ap_nouns.noun, ap_nouns.nounURL, ap_links.date FROM
-            ap_links JOIN ap_adjs ON ap_links.adjID = ap_adjs.adjID
-            JOIN ap_nouns ON ap_links.nounID = ap_nouns.nounID
-            WHERE ap_links.guildID = {guild_id}
-            AND ap_nouns.guildID = {guild_id}
-            AND ap_links.modID = {user_id}
-            ORDER BY ap_links.date DESC
-            LIMIT 1;"""
-        ap = await self.execute_query(query)
+        ap = await self.execute_statement(
+            statements.LOAD_AP, guild_id, guild_id, user_id
+        )
         return ap
 
     # Get a verified user from database
     async def get_verified_user_from_db(self, user_id):
-        query = f"""
-            SELECT token FROM verified_users
-            WHERE userID = {user_id};
-            """
-        user = await self.execute_query(query)
+        user = await self.execute_statement(statements.GET_VERIFIED_USER, user_id)
         return user
 
     # Add verified user to database
     async def add_verified_user_to_db(self, user_id, token):
-        query = f"""
-            INSERT INTO verified_users VALUES
-            ({user_id},
-            '{token}');
-            """
-        await self.execute_query(query, False)
+        await self.execute_statement(statements.ADD_VERIFIED_USER, user_id, token)
 
     # Get all blacklist entries from database
     async def get_all_blacklist_from_db(self, guild_id):
-        query = f"""
-            SELECT * from blacklist
-            WHERE guildID = {guild_id};
-            """
-        blacklist = await self.execute_query(query)
+        blacklist = await self.execute_statement(
+            statements.GET_ALL_BLACKLIST, guild_id
+        )
         return blacklist
 
     # Get one blacklist entry from database
     async def get_blacklist_from_db(self, guild_id, user_id):
-        query = f"""
-            SELECT userID from blacklist
-            WHERE guildID = {guild_id}
-            AND userID = {user_id};
-            """
-        user = await self.execute_query(query)
+        user = await self.execute_statement(
+            statements.GET_BLACKLIST, guild_id, user_id
+        )
         return user
 
     # Add blacklist entry
     async def add_blacklist_to_db(self, guild_id, user_id, reason, mod):
         epoch_time = int(time.time())
 
-        query = """
-            INSERT INTO blacklist (guildID, userID, reason, modID, modName, date) 
-            VALUES (%s, %s, %s, %s, %s, %s);
-            """
-        params = (guild_id, user_id, reason, mod.id, mod.name, epoch_time)
-        await self.execute_query(query, False, False, params)
+        await self.execute_statement(
+            statements.ADD_BLACKLIST,
+            guild_id,
+            user_id,
+            reason,
+            mod.id,
+            mod.name,
+            epoch_time,
+        )
 
     # Delete blacklist entry
     async def delete_blacklist_from_db(self, guild_id, user_id):
-        query = f"""
-            DELETE FROM blacklist
-            WHERE guildID = {guild_id}
-            AND userID = {user_id};
-            """
-        await self.execute_query(query, False)
+        await self.execute_statement(statements.DELETE_BLACKLIST, guild_id, user_id)
 
     # Get ticket types from database
     async def get_types_from_db(self, guild_id):
-        query = f"""
-            SELECT * FROM ticket_types
-            WHERE guildID = {guild_id}
-            ORDER BY typeID ASC;
-            """
-        types = await self.execute_query(query)
+        types = await self.execute_statement(statements.GET_TYPES, guild_id)
         return types
 
     async def get_types_from_db_v2(self, guild_id: int):
-        query = f"""
-            SELECT
-                typeID, guildID, categoryID, typeName, subType
-            FROM ticket_types
-            WHERE guildID = {guild_id};
-        """
-        rows = await self.execute_query(query)
+        rows = await self.execute_statement(statements.GET_TYPES_V2, guild_id)
 
         result = []
         for row in rows:
@@ -584,11 +721,8 @@ class DataManager:
     ):
         form_json = await self.template_form(type_name)
 
-        query = """
-            INSERT INTO ticket_types (guildID, categoryID, typeName, typeDescrip, typeEmoji, formJson, subType) 
-            VALUES (%s, %s, %s, %s, %s, %s, %s);
-            """
-        params = (
+        await self.execute_statement(
+            statements.ADD_TYPE,
             guild_id,
             category_id,
             type_name,
@@ -598,28 +732,17 @@ class DataManager:
             sub_type,
         )
 
-        await self.execute_query(query, False, False, params)
-
     async def set_form(self, guild_id, category_id, form=None):
         if form is None:
             form = await self.template_form("Ticket Form")
 
-        query = """
-            UPDATE ticket_types
-            SET formJson = %s
-            WHERE guildID = %s AND categoryID = %s;
-            """
-        params = (json.dumps(form), guild_id, category_id)
-        await self.execute_query(query, False, False, params)
+        await self.execute_statement(
+            statements.SET_FORM, json.dumps(form), guild_id, category_id
+        )
 
     # Delete ticket type
     async def delete_type_from_db(self, guild_id, category_id):
-        query = f"""
-            DELETE FROM ticket_types 
-            WHERE guildID = {guild_id}
-            AND categoryID = {category_id};
-            """
-        await self.execute_query(query, False)
+        await self.execute_statement(statements.DELETE_TYPE, guild_id, category_id)
 
     async def replace_type(self, old_category_id, new_category_id):
         # gpt here yeaaaaah
@@ -635,63 +758,36 @@ class DataManager:
     # pick a new category to reroute tickets to if you want, elsewise theyre now uncategorized
 
     async def get_permissions_from_db(self, guild_id):
-        query = f"""
-            SELECT roleID, permLevel FROM permissions
-            WHERE guildID = {guild_id};
-            """
-        permissions = await self.execute_query(query)
+        permissions = await self.execute_statement(
+            statements.GET_PERMISSIONS, guild_id
+        )
         return permissions
 
     # Add permission
     async def add_permission_to_db(self, guild_id, roleID, permLevel):
-        query = f"""
-            INSERT INTO permissions VALUES
-            ({guild_id},
-            {roleID},
-            '{permLevel}');
-            """
-        await self.execute_query(query, False)
+        await self.execute_statement(
+            statements.ADD_PERMISSION, guild_id, roleID, str(permLevel)
+        )
 
     # Delete permission
     async def delete_permission_from_db(self, guild_id, roleID):
-        query = f"""
-            DELETE FROM permissions 
-            WHERE guildID = {guild_id}
-            AND roleID = {roleID};
-            """
-        await self.execute_query(query, False)
+        await self.execute_statement(statements.DELETE_PERMISSION, guild_id, roleID)
 
     # Adds monitored channels / categories to DB
     async def add_monitor(self, guild_id: int, channel_id: int, type: str):
-        query = f"""
-            INSERT INTO channel_monitor VALUES 
-            ({guild_id}, 
-            {channel_id}, 
-            '{type}');
-            """
-        await self.execute_query(query, False)
+        await self.execute_statement(statements.ADD_MONITOR, guild_id, channel_id, type)
         await self.update_cache(1)
 
     # Removes monitored channels / categories from DB
     async def remove_monitor(self, channel_id: int):
-        query = f"""
-            DELETE FROM channel_monitor WHERE 
-            channel_monitor.channelID = {channel_id};
-            """
-        await self.execute_query(query, False)
+        await self.execute_statement(statements.REMOVE_MONITOR, channel_id)
         await self.update_cache(1)
 
     # Query for setting category as a type in the database
     async def set_type(self, guild_id: int, category_id: int, type_id: int):
-        query = f"""
-            INSERT INTO category_types
-            VALUES ({guild_id}, {category_id}, {type_id}) as matches
-            ON DUPLICATE KEY UPDATE 
-            guildID = matches.guildID,
-            categoryID = matches.categoryID,
-            type = matches.type;
-            """
-        await self.execute_query(query, False)
+        await self.execute_statement(
+            statements.SET_CATEGORY_TYPE, guild_id, category_id, type_id
+        )
         await self.update_cache(2)
 
     async def set_ping_roles(self, guild_id, roles):
@@ -701,13 +797,16 @@ class DataManager:
             if int(type["sub_type"]) == -1:
                 type_ids.append(type["type_id"])
 
+        # IN list length varies per guild, so this one is built per call
+        placeholders = ", ".join(["%s"] * len(type_ids))
         query = f"""
             UPDATE ticket_types
             SET pingRoles = %s
-            WHERE guildID = {guild_id} 
-            AND typeID IN ({', '.join(map(str, type_ids))});
+            WHERE guildID = %s
+            AND typeID IN ({placeholders});
             """
-        await self.execute_query(query, False, False, (json.dumps(roles),))
+        params = (json.dumps(roles), guild_id, *type_ids)
+        await self.execute_query(query, False, False, params)
 
     # Adds verbal to DB
     async def add_note(
@@ -721,11 +820,8 @@ class DataManager:
     ):
         epoch_time = int(datetime.now(timezone.utc).timestamp())
 
-        query = """
-            INSERT INTO notes (guildID, userID, ticketID, authorID, authorName, date, content)
-            VALUES (%s, %s, %s, %s, %s, %s, %s);
-            """
-        values = (
+        await self.execute_statement(
+            statements.ADD_NOTE,
             guild_id,
             user_id,
             ticket_id,
@@ -734,34 +830,23 @@ class DataManager:
             epoch_time,
             content,
         )
-        await self.execute_query(query, False, False, values)
 
     # Removes verbal from DB
     async def remove_note(self, noteID: int):
-        query = f"""
-            DELETE FROM notes WHERE 
-            notes.noteID = {noteID};
-            """
-        await self.execute_query(query, False)
+        await self.execute_statement(statements.REMOVE_NOTE, noteID)
 
     # Get all notes for user from DB
     async def get_user_note_history(self, guild_id: int, user_id: int):
-        query = f"""
-            SELECT *
-            FROM notes WHERE
-            notes.guildID = {guild_id} AND notes.userID = {user_id};
-            """
-        content = await self.execute_query(query)
+        content = await self.execute_statement(
+            statements.GET_USER_NOTES, guild_id, user_id
+        )
         return content
 
     # Get all notes for user from DB
     async def get_ticket_note_history(self, guild_id: int, ticket_id: int):
-        query = f"""
-            SELECT *
-            FROM notes WHERE
-            notes.guildID = {guild_id} AND notes.ticketID = {ticket_id};
-            """
-        content = await self.execute_query(query)
+        content = await self.execute_statement(
+            statements.GET_TICKET_NOTES, guild_id, ticket_id
+        )
         return content
 
     # Adds verbal to DB
@@ -776,11 +861,8 @@ class DataManager:
     ):
         epoch_time = int(datetime.now(timezone.utc).timestamp())
 
-        query = """
-            INSERT INTO verbals (messageID, guildID, userID, authorID, authorName, date, content)
-            VALUES (%s, %s, %s, %s, %s, %s, %s);
-            """
-        values = (
+        await self.execute_statement(
+            statements.ADD_VERBAL,
             message_id,
             guild_id,
             user_id,
@@ -789,15 +871,10 @@ class DataManager:
             epoch_time,
             content,
         )
-        await self.execute_query(query, False, False, values)
 
     # Removes verbal from DB
     async def remove_verbal(self, message_id: int):
-        query = f"""
-            DELETE FROM verbals WHERE 
-            verbals.messageID = {message_id};
-            """
-        await self.execute_query(query, False)
+        await self.execute_statement(statements.REMOVE_VERBAL, message_id)
 
     # Edit verbal in DB
     async def edit_verbal(
@@ -805,34 +882,25 @@ class DataManager:
     ):
         epoch_time = int(datetime.now(timezone.utc).timestamp())
 
-        query = """
-            UPDATE verbals
-            SET verbals.authorID = %s, 
-            verbals.authorName = %s, 
-            verbals.date = %s, 
-            verbals.content = %s
-            WHERE verbals.messageID = %s;
-            """
-        params = (author_id, author_name, epoch_time, content, message_id)
-        await self.execute_query(query, False, False, params)
+        await self.execute_statement(
+            statements.EDIT_VERBAL,
+            author_id,
+            author_name,
+            epoch_time,
+            content,
+            message_id,
+        )
 
     # Gets verbal from DB
     async def get_verbal(self, message_id: int):
-        query = f"""
-            SELECT * FROM verbals WHERE
-            verbals.messageID = {message_id};
-            """
-        content = await self.execute_query(query)
+        content = await self.execute_statement(statements.GET_VERBAL, message_id)
         return content
 
     # Get all verbals for user from DB
     async def get_verbal_history(self, guild_id: int, userID: int):
-        query = f"""
-            SELECT verbals.messageID, verbals.authorID, verbals.authorName, verbals.date, verbals.content
-            FROM verbals WHERE
-            verbals.guildID = {guild_id} AND verbals.userID = {userID};
-            """
-        content = await self.execute_query(query)
+        content = await self.execute_statement(
+            statements.GET_VERBAL_HISTORY, guild_id, userID
+        )
         return content
 
     # Adds snip to DB
@@ -845,39 +913,50 @@ class DataManager:
         summary: str = "None",
     ):
         epoch_time = int(time.time())
-        query = """
-            INSERT INTO snips (guildID, authorID, abbrev, summary, content, date)
-            VALUES (%s, %s, %s, %s, %s, %s);
-            """
-        values = (guild_id, author_id, abbrev, summary, content, epoch_time)
-        await self.execute_query(query, False, False, values)
+        await self.execute_statement(
+            statements.ADD_SNIP,
+            guild_id,
+            author_id,
+            abbrev,
+            summary,
+            content,
+            epoch_time,
+        )
 
     # Removes snip from DB
     async def remove_snip(self, guild_id: int, abbrev: str):
-        query = f"""
-            DELETE FROM snips WHERE 
-            snips.guildID = {guild_id} AND snips.abbrev = '{abbrev}';
-            """
-        await self.execute_query(query, False)
+        await self.execute_statement(statements.REMOVE_SNIP, guild_id, abbrev)
 
     # Gets snip from DB
     async def get_snip(self, guild_id: int, abbrev: str):
-        query = f"""
-            SELECT snips.content FROM snips WHERE
-            snips.guildID = {guild_id} AND snips.abbrev = '{abbrev}';
-            """
-        content = await self.execute_query(query)
+        content = await self.execute_statement(statements.GET_SNIP, guild_id, abbrev)
         return content
 
     # Get all snips from DB
     async def get_all_snips(self, guild_id: int):
-        query = f"""
-            SELECT * FROM snips WHERE
-            snips.guildID = {guild_id};
-            """
-        content = await self.execute_query(query)
+        content = await self.execute_statement(statements.GET_ALL_SNIPS, guild_id)
         return content
 
+    # Half-open probe run from the heartbeat, closes the breaker as soon as
+    # MySQL answers again without waiting for user traffic to trial it
+    async def probe_db(self):
+        if not self.db_breaker.is_open or not self.db_breaker.allow_request():
+            return
+
+        # Settled however the probe ends, a hung or cancelled probe is a failure
+        healthy = False
+        try:
+            healthy = await asyncio.wait_for(
+                self.check_db_health(), timeout=db_acquire_timeout + 6
+            )
+        except asyncio.TimeoutError:
+            logger.error("Database health check timed out")
+        finally:
+            if healthy:
+                self.db_breaker.record_success()
+            else:
+                self.db_breaker.record_failure()
+
     # DB health check, not currently active
     async def check_db_health(self):
         try:
@@ -915,6 +994,8 @@ class DataManager:
         if self.redis is None:
             try:
                 self.redis = redis.Redis.from_url(self.redis_url, decode_responses=True)
+                self.read_buffer_script = self.redis.register_script(READ_BUFFER_LUA)
+                self.clear_buffer_script = self.redis.register_script(CLEAR_BUFFER_LUA)
                 # Test connection
                 await self.redis.ping()
                 logger.success("Redis cache connection established")
@@ -969,22 +1050,67 @@ class DataManager:
         except Exception as e:
             logger.exception(f"Error loading status from Redis: {e}")
 
-    # Save timers to Redis
+    # Saves one timer, O(log n) in the sorted set instead of rewriting them all
+    async def save_timer(self, channel_id, fields):
+        end_time, mod_id, opener_id, reason = fields
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.zadd(TIMERS_DUE, {channel_id: end_time})
+                pipe.hset(
+                    TIMERS_DATA, channel_id, json.dumps([mod_id, opener_id, reason])
+                )
+                await pipe.execute()
+        except Exception as e:
+            logger.exception(f"Error saving timer to Redis: {e}")
+
+    async def delete_timer(self, channel_id):
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.zrem(TIMERS_DUE, channel_id)
+                pipe.hdel(TIMERS_DATA, channel_id)
+                await pipe.execute()
+        except Exception as e:
+            logger.exception(f"Error deleting timer from Redis: {e}")
+
+    # Save timers to Redis, replacing whatever is stored
     async def save_timers_to_redis(self):
+        timers = self.bot.channel_status.timers
         try:
-            await self.redis.set("timers", json.dumps(self.bot.channel_status.timers))
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.delete(TIMERS_DUE, TIMERS_DATA)
+                if timers:
+                    pipe.zadd(
+                        TIMERS_DUE,
+                        {
+                            channel_id: fields[0]
+                            for channel_id, fields in timers.items()
+                        },
+                    )
+                    pipe.hset(
+                        TIMERS_DATA,
+                        mapping={
+                            channel_id: json.dumps(fields[1:])
+                            for channel_id, fields in timers.items()
+                        },
+                    )
+                await pipe.execute()
         except Exception as e:
             logger.exception(f"Error saving timers to Redis: {e}")
 
     # Load timers from Redis
     async def load_timers_from_redis(self):
         try:
-            self.bot.channel_status.timers = json.loads(
-                await self.redis.get("timers") or "{}"
-            )
-            self.bot.channel_status.timers = {
-                int(key): value for key, value in self.bot.channel_status.timers.items()
-            }
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.zrange(TIMERS_DUE, 0, -1, withscores=True)
+                pipe.hgetall(TIMERS_DATA)
+                due, data = await pipe.execute()
+
+            timers = {}
+            for channel_id, end_time in due:
+                fields = data.get(channel_id)
+                if fields is not None:
+                    timers[int(channel_id)] = [end_time, *json.loads(fields)]
+            self.bot.channel_status.set_timers(timers)
         except Exception as e:
             logger.error(f"Error loading timers from Redis: {e}")
 
@@ -1033,6 +1159,11 @@ class DataManager:
         key = f"linked_msgs:{channel_id}"
         await self.redis.delete(key)
 
+    # get_or_load callers skip the cache to force a DB refresh, but while the
+    # database circuit is open the cached copy is served instead
+    def _read_cache(self, get: bool) -> bool:
+        return get or self.db_breaker.is_open
+
     def format_config(
         self,
         guild_id,
@@ -1075,7 +1206,7 @@ class DataManager:
 
     async def get_or_load_config(self, guild_id: int, get=True):
         redis_key = f"config:{guild_id}"
-        if get:
+        if self._read_cache(get):
             cached = await self.redis.get(redis_key)
 
             if cached:
@@ -1094,7 +1225,7 @@ class DataManager:
 
     async def get_or_load_ap(self, guild_id: int, userID: int, get=True):
         redis_key = f"aps:{guild_id}:{userID}"
-        if get:
+        if self._read_cache(get):
             cached = await self.redis.get(redis_key)
 
             if cached:
@@ -1111,7 +1242,7 @@ class DataManager:
     # Combined load/get user tickets from Redis, with fallback to DB
     async def get_or_load_user_tickets(self, userID: int, get=True) -> list[dict]:
         redis_key = f"user_tickets:{userID}"
-        if get:
+        if self._read_cache(get):
             redis_key = f"user_tickets:{userID}"
             fields = await self.redis.hgetall(redis_key)
 
@@ -1141,7 +1272,7 @@ class DataManager:
     # Lazy get or load verified user
     async def get_or_load_verified_user(self, userID: int, get=True):
         redis_key = f"verified_users:{userID}"
-        if get:
+        if self._read_cache(get):
             cached = await self.redis.hget(redis_key, "data")
 
             if cached:
@@ -1204,7 +1335,7 @@ class DataManager:
     async def get_or_load_snips(self, guild_id, get=True):
         redis_key = f"snips:{guild_id}"
 
-        if get:
+        if self._read_cache(get):
             cached = await self.redis.get(redis_key)
             if cached:
                 return json.loads(cached)
@@ -1261,7 +1392,7 @@ class DataManager:
     async def get_or_load_guild_types(self, guild_id, get=True):
         redis_key = f"ticket_types:{guild_id}"
 
-        if get:
+        if self._read_cache(get):
             cached = await self.redis.get(redis_key)
             if cached:
                 return json.loads(cached)
@@ -1315,7 +1446,7 @@ class DataManager:
     # Lazy get or load permissions for a guild
     async def get_or_load_permissions(self, guild_id, get=True):
         redis_key = f"permissions:{guild_id}"
-        if get:
+        if self._read_cache(get):
             cached = await self.redis.hgetall(redis_key)
 
             if cached:
@@ -1348,8 +1479,10 @@ class DataManager:
     async def add_ticket(self, channel_id: int, modmail_log_id: int):
         key = f"tickets:{channel_id}"
         try:
-            # Redis hash
+            # Redis hash, plus index entries for channel and modmail lookups
             await self.redis.hset(key, mapping={"modmail_log_id": modmail_log_id})
+            await self.redis.sadd(TICKETS_INDEX, channel_id)
+            await self.redis.hset(MODMAIL_INDEX, str(modmail_log_id), channel_id)
 
         except Exception as e:
             logger.exception(f"Error adding ticket to Redis: {e}")
@@ -1372,60 +1505,125 @@ class DataManager:
     async def remove_ticket(self, channel_id: int):
         key = f"tickets:{channel_id}"
         try:
+            modmail_log_id = await self.redis.hget(key, "modmail_log_id")
             await self.redis.delete(key)
+            await self.redis.srem(TICKETS_INDEX, channel_id)
+            if modmail_log_id is not None:
+                await self.redis.hdel(MODMAIL_INDEX, modmail_log_id)
             return
 
         except Exception as e:
             logger.exception(f"Error removing ticket from Redis: {e}")
             return
 
-    # Remove one ticket using modmail_message_id (cannot use key lookup)
+    # Remove one ticket using modmail_message_id, resolved through the modmail index
     async def remove_ticket_modmail(self, modmail_message_id: int):
         try:
-            keys = await self.redis.keys("tickets:*")
-            if not keys:
+            channel_id = await self.redis.hget(MODMAIL_INDEX, str(modmail_message_id))
+            if channel_id is None:
                 return
 
-            # Iterate through keys to find the matching modmail_message_id
-            for key in keys:
-                ticket_data = await self.redis.hgetall(key)
-
-                if (
-                    ticket_data
-                    and int(ticket_data["modmail_log_id"]) == modmail_message_id
-                ):
-                    await self.redis.delete(key)
-                    return
+            await self.redis.delete(f"tickets:{channel_id}")
+            await self.redis.srem(TICKETS_INDEX, channel_id)
+            await self.redis.hdel(MODMAIL_INDEX, str(modmail_message_id))
 
         except Exception as e:
             logger.exception(f"Error removing ticket from Redis: {e}")
             return
 
-    # Returns a list of all channel IDs (cleaned of their Redis table name)
+    # Returns a list of all channel IDs in the open tickets index
     async def get_all_channel_ids(self) -> List[int]:
         try:
-            keys = await self.redis.keys("tickets:*")
-            if not keys:
-                return []
-
-            # Extract channel IDs from the keys
-            channel_ids = [int(key.split(":")[1]) for key in keys]
-            return channel_ids
+            members = await self.redis.smembers(TICKETS_INDEX)
+            return [int(channel_id) for channel_id in members]
 
         except Exception as e:
             logger.exception(f"Error retrieving ticket channel IDs from Redis: {e}")
             return []
 
-    # Deletes all tickets (NOT REVERSIBLE)
-    async def empty_tickets(self):
+    # Adds ticket and message keys written before the index sets existed to
+    # them, once per Redis. Without it those tickets are never cleaned up and
+    # their buffered messages are never flushed
+    async def backfill_indexes(self):
         try:
-            keys = await self.redis.keys("tickets:*")
-            if not keys:
+            if await self.redis.exists(INDEX_BACKFILL_DONE):
                 return
 
+            tickets = 0
+            batch = []
+            async for key in self.redis.scan_iter(match="tickets:*", count=SCAN_COUNT):
+                batch.append(key)
+                if len(batch) >= SCAN_COUNT:
+                    tickets += await self._backfill_tickets(batch)
+                    batch = []
+            if batch:
+                tickets += await self._backfill_tickets(batch)
+
+            messages = await self._backfill_index("ticket_messages", MESSAGES_INDEX)
+            messages_v2 = await self._backfill_index(
+                "ticket_messages_v2", MESSAGES_V2_INDEX
+            )
+
+            await self.redis.set(INDEX_BACKFILL_DONE, int(time.time()))
+            logger.success(
+                f"Indexed {tickets} tickets, {messages} ticket messages and "
+                f"{messages_v2} ticket messages_v2 from existing keys"
+            )
+
+        except Exception as e:
+            logger.exception(f"Error backfilling Redis indexes: {e}")
+
+    async def _backfill_tickets(self, keys: list) -> int:
+        async with self.redis.pipeline(transaction=False) as pipe:
             for key in keys:
-                await self.redis.delete(key)
-            logger.success(f"Deleted {len(keys)} tickets from Redis")
+                pipe.hget(key, "modmail_log_id")
+            modmail_log_ids = await pipe.execute()
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, modmail_log_id in zip(keys, modmail_log_ids):
+                channel_id = key.split(":", 1)[1]
+                pipe.sadd(TICKETS_INDEX, channel_id)
+                if modmail_log_id is not None:
+                    pipe.hset(MODMAIL_INDEX, modmail_log_id, channel_id)
+            await pipe.execute()
+        return len(keys)
+
+    # Adds the message ID of every {prefix}:{message_id} hash to index
+    async def _backfill_index(self, prefix: str, index: str) -> int:
+        added = 0
+        batch = []
+        async for key in self.redis.scan_iter(match=f"{prefix}:*", count=SCAN_COUNT):
+            batch.append(key.split(":", 1)[1])
+            if len(batch) >= SCAN_COUNT:
+                added += await self.redis.sadd(index, *batch)
+                batch = []
+
+        if batch:
+            added += await self.redis.sadd(index, *batch)
+        return added
+
+    # Cursor-based delete of every key matching pattern, never blocks Redis
+    # for a full keyspace walk. Returns the number of keys deleted
+    async def _scan_delete(self, pattern: str) -> int:
+        deleted = 0
+        batch = []
+        async for key in self.redis.scan_iter(match=pattern, count=SCAN_COUNT):
+            batch.append(key)
+            if len(batch) >= SCAN_COUNT:
+                deleted += await self.redis.delete(*batch)
+                batch = []
+
+        if batch:
+            deleted += await self.redis.delete(*batch)
+        return deleted
+
+    # Deletes all tickets (NOT REVERSIBLE)
+    async def empty_tickets(self):
+        try:
+            deleted = await self._scan_delete("tickets:*")
+            await self.redis.delete(TICKETS_INDEX, MODMAIL_INDEX)
+            if deleted:
+                logger.success(f"Deleted {deleted} tickets from Redis")
 
         except Exception as e:
             logger.exception(f"Error during Redis tickets empty: {e}")
@@ -1441,48 +1639,60 @@ class DataManager:
         message_type: str,
         v2: bool = False,
     ):
-        key = ""
-        mapping = {}
-
-        if v2:
-            key = f"ticket_messages_v2:{message_id}"
-            mapping = {
-                "channelID": channel_id,
-                "authorID": author_id,
-                "date": date,
-                "type": message_type,
-            }
-        else:
-            key = f"ticket_messages:{message_id}"
-            mapping = {
-                "modmail_messageID": modmail_message_id,
-                "channelID": channel_id,
-                "authorID": author_id,
-                "date": date,
-                "type": message_type,
-            }
         try:
-            await self.redis.hset(key, mapping=mapping)
             if v2:
+                fields = {
+                    "messageID": message_id,
+                    "channelID": channel_id,
+                    "authorID": author_id,
+                    "date": date,
+                    "type": message_type,
+                }
+                await self.redis.xadd(MESSAGES_V2_STREAM, fields)
                 self.ticket_count_v2 += 1
             else:
+                key = f"ticket_messages:{message_id}"
+                mapping = {
+                    "modmail_messageID": modmail_message_id,
+                    "channelID": channel_id,
+                    "authorID": author_id,
+                    "date": date,
+                    "type": message_type,
+                }
+                await self.redis.hset(key, mapping=mapping)
+                await self.redis.sadd(MESSAGES_INDEX, message_id)
                 self.ticket_count += 1
 
-            # Batch flush cache if 20 messages have collected
-            if self.ticket_count > 19:
-                await self.flush_messages()
+            # Wake the flush worker once a batch has collected
+            pending = max(self.ticket_count, self.ticket_count_v2)
+            if pending >= self.flush_batch_size:
+                self.flush_event.set()
 
-            if self.ticket_count_v2 > 19:
-                await self.flush_messages_v2()
+            # Back-pressure, MySQL is falling behind so slow producers down for
+            # at most flush_max_wait. While flushes are failing waiting cannot
+            # help, the messages stay buffered in Redis until MySQL is back
+            if pending >= self.flush_max_pending and self.flush_healthy:
+                self.drained_event.clear()
+                try:
+                    await asyncio.wait_for(
+                        self.drained_event.wait(), timeout=self.flush_max_wait
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning(
+                        f"Message buffer still at {pending} entries after "
+                        f"{self.flush_max_wait}s, continuing"
+                    )
 
         except Exception as e:
             logger.exception(f"Error adding ticket message to Redis: {e}")
 
     # Remove one ticket message from the cache, relies on the ticket's message_id
+    # v2 messages are append-only stream events and cannot be removed by ID
     async def remove_ticket_message(self, message_id: int, v2: bool = False):
         key = f"ticket_messages:{message_id}"
         try:
             await self.redis.delete(key)
+            await self.redis.srem(MESSAGES_INDEX, message_id)
 
         except Exception as e:
             logger.exception(f"Error removing ticket message from Redis: {e}")
@@ -1491,13 +1701,10 @@ class DataManager:
     # Deletes all ticket messages (NOT REVERSIBLE)
     async def empty_messages(self, v2: bool = False):
         try:
-            keys = await self.redis.keys("ticket_messages:*")
-            if not keys:
-                return
-
-            for key in keys:
-                await self.redis.delete(key)
-            logger.success(f"Deleted {len(keys)} ticket messages from Redis")
+            deleted = await self._scan_delete("ticket_messages:*")
+            await self.redis.delete(MESSAGES_INDEX, f"{MESSAGES_INDEX}:draining")
+            if deleted:
+                logger.success(f"Deleted {deleted} ticket messages from Redis")
 
         except Exception as e:
             logger.exception(f"Error during Redis empty: {e}")
@@ -1505,109 +1712,277 @@ class DataManager:
     # Deletes all ticket messages (NOT REVERSIBLE)
     async def empty_messages_v2(self, v2: bool = False):
         try:
-            keys = await self.redis.keys("ticket_messages_v2:*")
-            if not keys:
-                return
-
-            for key in keys:
-                await self.redis.delete(key)
-            logger.success(f"Deleted {len(keys)} ticket messages_v2 from Redis")
+            deleted = await self.redis.xlen(MESSAGES_V2_STREAM)
+            deleted += await self._scan_delete("ticket_messages_v2:*")
+            await self.redis.delete(
+                MESSAGES_V2_STREAM, MESSAGES_V2_INDEX, f"{MESSAGES_V2_INDEX}:draining"
+            )
+            await self.ensure_message_stream()
+            self.ticket_count_v2 = 0
+            if deleted:
+                logger.success(f"Deleted {deleted} ticket messages_v2 from Redis")
 
         except Exception as e:
             logger.exception(f"Error during Redis empty: {e}")
 
-    # Copies all ticket messages to DB, then deletes them
-    # Uses asyncio.Lock() to ensure another flush cannot occur before the current flush is done
-    async def flush_messages(self):
-        # Get the lock
-        async with self.flush_lock:
+    # Reconnects rerun data_startup, the running worker is kept
+    async def start_flush_worker(self):
+        if self.flush_worker_task and not self.flush_worker_task.done():
+            return
+
+        try:
+            self.flush_worker_task = asyncio.create_task(self.flush_worker())
+            logger.success("Flush worker started")
+
+        except Exception as e:
+            logger.error(f"Error starting flush worker: {e}")
+
+    # Stops the flush worker, then drains whatever is still buffered
+    async def stop_flush_worker(self):
+        if self.flush_worker_task is not None:
+            self.flush_worker_task.cancel()
             try:
-                keys = await self.redis.keys("ticket_messages:*")
-                if not keys:
-                    return
-
-                messages_to_insert = []
-                for key in keys:
-                    message = await self.redis.hgetall(key)
-                    # Extract message ID from the key
-                    messageID = key.split(":")[1]
-                    if message:
-                        messages_to_insert.append(
-                            (
-                                message["modmail_messageID"],
-                                messageID,
-                                message["channelID"],
-                                message["authorID"],
-                                message["date"],
-                                message["type"],
-                            )
-                        )
+                await self.flush_worker_task
+            except asyncio.CancelledError:
+                pass
+            self.flush_worker_task = None
+
+        if self.redis is not None and self.db_pool is not None:
+            await self.flush_messages()
+            await self.flush_messages_v2()
+            logger.success("Flush worker shut down, message buffers drained")
+
+    # Worker, flushes ticket messages to the DB once a batch has collected or
+    # flush_max_latency has passed, whichever comes first. Keeps DB writes off
+    # the message relay path
+    async def flush_worker(self):
+        while True:
+            try:
+                try:
+                    await asyncio.wait_for(
+                        self.flush_event.wait(), timeout=self.flush_max_latency
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                self.flush_event.clear()
+
+                # Buffers may hold messages from a previous process, so always
+                # check them rather than trusting the in-process counters
+                flushed = await self.flush_messages()
+                flushed_v2 = await self.flush_messages_v2()
+                self.flush_healthy = flushed and flushed_v2
+
+                # Producers are only released once the backlog actually shrank
+                pending = max(self.ticket_count, self.ticket_count_v2)
+                if (flushed or flushed_v2) and pending < self.flush_max_pending:
+                    self.drained_event.set()
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                logger.exception(f"Flush worker sent an error: {e}")
+                await asyncio.sleep(5)
+
+    # Holds the flush lock for one table, recording how long callers waited for it
+    @asynccontextmanager
+    async def _flush_guard(self, table: str):
+        start = time.perf_counter()
+        async with self.flush_locks[table]:
+            waited = time.perf_counter() - start
+            metrics = self.flush_metrics[table]
+            metrics["flushes"] += 1
+            metrics["lock_wait_total"] += waited
+            metrics["lock_wait_max"] = max(metrics["lock_wait_max"], waited)
+            if waited > 1:
+                logger.warning(f"Waited {waited:.2f}s for the {table} flush lock")
+            yield
+
+    # Returns per-table flush counts and lock wait times (seconds)
+    def get_flush_metrics(self) -> Dict[str, dict]:
+        result = {}
+        for table, metrics in self.flush_metrics.items():
+            flushes = metrics["flushes"]
+            average = metrics["lock_wait_total"] / flushes if flushes else 0.0
+            result[table] = {**metrics, "lock_wait_avg": average}
+        return result
+
+    # Swaps the live buffer out and reads every message hash in it, one round trip
+    # Returns a dict of {message_id: fields}, messages whose hash expired are {}
+    async def _read_message_buffer(self, index: str, prefix: str) -> Dict[str, dict]:
+        flat = await self.read_buffer_script(
+            keys=[index, f"{index}:draining"], args=[f"{prefix}:"]
+        )
+        buffer = {}
+        for message_id, fields in zip(flat[::2], flat[1::2]):
+            buffer[message_id] = dict(zip(fields[::2], fields[1::2]))
+        return buffer
+
+    # Deletes the drained buffer and its message hashes in one round trip
+    async def _clear_message_buffer(self, index: str, prefix: str):
+        await self.clear_buffer_script(
+            keys=[index, f"{index}:draining"], args=[f"{prefix}:"]
+        )
+
+    # Copies all ticket messages to DB, then deletes them, returns False if the
+    # flush failed. Writes during the flush go to a fresh buffer and are picked
+    # up next time
+    async def flush_messages(self) -> bool:
+        # Get this table's lock, v2 flushes are not blocked
+        async with self._flush_guard("ticket_messages"):
+            try:
+                buffer = await self._read_message_buffer(
+                    MESSAGES_INDEX, "ticket_messages"
+                )
+                if not buffer:
+                    return True
+
+                messages_to_insert = [
+                    (
+                        message["modmail_messageID"],
+                        messageID,
+                        message["channelID"],
+                        message["authorID"],
+                        message["date"],
+                        message["type"],
+                    )
+                    for messageID, message in buffer.items()
+                    if message
+                ]
 
                 # Attempt SQL transaction, roll back changes if any message fails to insert
-                query = """
-                    INSERT INTO ticket_messages (modmail_messageID, messageID, channelID, authorID, date, type)
-                    VALUES (%s, %s, %s, %s, %s, %s) AS messages
-                    ON DUPLICATE KEY UPDATE 
-                        modmail_messageID = messages.modmail_messageID,
-                        channelID = messages.channelID,
-                        authorID = messages.authorID,
-                        date = messages.date,
-                        type = messages.type; 
-                        """
-                await self.execute_query(query, False, True, messages_to_insert)
+                if messages_to_insert:
+                    await self.execute_query(
+                        statements.INSERT_TICKET_MESSAGES.sql,
+                        False,
+                        True,
+                        messages_to_insert,
+                    )
 
             except Exception as e:
                 logger.exception(f"Error during cache flush: {e}")
-            else:
-                # Delete only processed keys from Redis
-                for key in keys:
-                    await self.redis.delete(key)
-
-                self.ticket_count = 0
+                return False
 
-    # Copies all ticket messages_v2 to DB, then deletes them
-    # Uses asyncio.Lock() to ensure another flush cannot occur before the current flush is done
-    async def flush_messages_v2(self):
-        # Get the lock
-        async with self.flush_lock:
+            # Delete only processed keys from Redis
             try:
-                keys = await self.redis.keys("ticket_messages_v2:*")
-                if not keys:
-                    return
-
-                messages_to_insert = []
-                for key in keys:
-                    message = await self.redis.hgetall(key)
-                    # Extract message ID from the key
-                    messageID = key.split(":")[1]
+                await self._clear_message_buffer(MESSAGES_INDEX, "ticket_messages")
+            except Exception as e:
+                logger.exception(f"Error clearing flushed messages: {e}")
+                return False
+            self.ticket_count = max(0, self.ticket_count - len(buffer))
+            return True
+
+    # Creates the v2 message stream and consumer group if missing, then moves
+    # any messages left in the legacy per-message hashes onto the stream
+    async def ensure_message_stream(self):
+        try:
+            await self.redis.xgroup_create(
+                MESSAGES_V2_STREAM, MESSAGES_V2_GROUP, id="0", mkstream=True
+            )
+        except redis.ResponseError as e:
+            # BUSYGROUP, the group already exists
+            if "BUSYGROUP" not in str(e):
+                logger.error(f"Error creating message stream group: {e}")
+                return
+
+        try:
+            buffer = await self._read_message_buffer(
+                MESSAGES_V2_INDEX, "ticket_messages_v2"
+            )
+            if not buffer:
+                return
+
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for messageID, message in buffer.items():
                     if message:
-                        messages_to_insert.append(
-                            (
-                                message["channelID"],
-                                messageID,
-                                message["authorID"],
-                                message["date"],
-                                message["type"],
-                            )
+                        fields = {"messageID": messageID, **message}
+                        pipe.xadd(MESSAGES_V2_STREAM, fields)
+                await pipe.execute()
+
+            await self._clear_message_buffer(MESSAGES_V2_INDEX, "ticket_messages_v2")
+            logger.success(f"Moved {len(buffer)} legacy v2 messages onto the stream")
+
+        except Exception as e:
+            logger.exception(f"Error migrating legacy v2 messages: {e}")
+
+    # Returns the next batch of v2 stream entries for this consumer, in order:
+    # entries it was delivered but never acknowledged (a failed flush or a crash),
+    # entries idle on other consumers (claimed), then new entries
+    async def _read_message_stream(self) -> list:
+        pending = await self.redis.xreadgroup(
+            MESSAGES_V2_GROUP,
+            STREAM_CONSUMER,
+            {MESSAGES_V2_STREAM: "0"},
+            count=STREAM_READ_COUNT,
+        )
+        if pending and pending[0][1]:
+            return pending[0][1]
+
+        claimed = await self.redis.xautoclaim(
+            MESSAGES_V2_STREAM,
+            MESSAGES_V2_GROUP,
+            STREAM_CONSUMER,
+            min_idle_time=STREAM_CLAIM_IDLE,
+            start_id="0-0",
+            count=STREAM_READ_COUNT,
+        )
+        if claimed and claimed[1]:
+            return claimed[1]
+
+        new = await self.redis.xreadgroup(
+            MESSAGES_V2_GROUP,
+            STREAM_CONSUMER,
+            {MESSAGES_V2_STREAM: ">"},
+            count=STREAM_READ_COUNT,
+        )
+        if new:
+            return new[0][1]
+        return []
+
+    # Copies all ticket messages_v2 stream entries to DB, then acknowledges and
+    # trims them, returns False if the flush failed. Inserts are upserts keyed
+    # on messageID, so a re-delivered entry after a crash is harmless. New
+    # events keep appending during a flush
+    async def flush_messages_v2(self) -> bool:
+        # Get this table's lock, v1 flushes are not blocked
+        async with self._flush_guard("ticket_messages_v2"):
+            try:
+                while True:
+                    entries = await self._read_message_stream()
+                    if not entries:
+                        return True
+
+                    # Deleted entries are re-delivered with no fields
+                    messages_to_insert = [
+                        (
+                            message["channelID"],
+                            message["messageID"],
+                            message["authorID"],
+                            message["date"],
+                            message["type"],
+                        )
+                        for _, message in entries
+                        if message
+                    ]
+
+                    # Attempt SQL transaction, roll back if any message fails to insert
+                    if messages_to_insert:
+                        await self.execute_query(
+                            statements.INSERT_TICKET_MESSAGES_V2.sql,
+                            False,
+                            True,
+                            messages_to_insert,
                         )
 
-                # Attempt SQL transaction, roll back changes if any message fails to insert
-                query = """
-                        INSERT INTO ticket_messages_v2 (channelID, messageID, authorID, date, type)
-                        VALUES (%s, %s, %s, %s, %s) AS messages
-                        ON DUPLICATE KEY UPDATE 
-                            channelID = messages.channelID,
-                            authorID = messages.authorID,
-                            date = messages.date,
-                            type = messages.type; 
-                            """
-                await self.execute_query(query, False, True, messages_to_insert)
+                    # Acknowledge and trim only the processed entries
+                    entry_ids = [entry_id for entry_id, _ in entries]
+                    async with self.redis.pipeline(transaction=False) as pipe:
+                        pipe.xack(MESSAGES_V2_STREAM, MESSAGES_V2_GROUP, *entry_ids)
+                        pipe.xdel(MESSAGES_V2_STREAM, *entry_ids)
+                        await pipe.execute()
+
+                    self.ticket_count_v2 = max(0, self.ticket_count_v2 - len(entries))
 
             except Exception as e:
                 logger.exception(f"Error during v2 cache flush: {e}")
-            else:
-                # Delete only processed keys from Redis
-                for key in keys:
-                    await self.redis.delete(key)
-
-                self.ticket_count_v2 = 0
+                return False
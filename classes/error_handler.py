@@ -51,6 +51,18 @@ class DBConnectionError(StartupError):
         super().__init__(f"Database connection failed: {original_exception}")
 
 
+class DBUnavailableError(Exception):
+    """Raised instead of querying while the database circuit breaker is open."""
+
+    pass
+
+
+class DBAcquireTimeoutError(Exception):
+    """Raised when no pooled database connection frees up in time."""
+
+    pass
+
+
 class CogLoadError(StartupError):
     """Raised when a cog fails to load."""
 
@@ -0,0 +1,164 @@
+import sys
+import time
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+ENTRY_OVERHEAD = 120  # bytes, OrderedDict node plus CacheEntry
+
+# Values a cached object holds itself and payload_sizeof counts. Any other
+# object it refers to (connection state, its guild) is shared and skipped
+SCALAR_TYPES = (str, bytes, int, float, bool, datetime, type(None))
+CONTAINER_TYPES = (tuple, list, set, frozenset, dict)
+MAX_DEPTH = 4
+
+
+@lru_cache(maxsize=None)
+def _slot_names(cls: type) -> Tuple[str, ...]:
+    names = []
+    for klass in cls.__mro__:
+        slots = klass.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        names.extend(name for name in slots if name not in ("__dict__", "__weakref__"))
+    return tuple(names)
+
+
+# Estimates the memory a cached value retains: the object, its own scalars and
+# containers and the objects inside those, e.g. a channel's overwrites. Much
+# closer than a shallow getsizeof, which counts only an object's header
+def payload_sizeof(value: Any, _depth: int = 0) -> int:
+    size = sys.getsizeof(value)
+    if isinstance(value, SCALAR_TYPES) or _depth >= MAX_DEPTH:
+        return size
+
+    if isinstance(value, dict):
+        items = [item for pair in value.items() for item in pair]
+    elif isinstance(value, CONTAINER_TYPES):
+        items = value
+    else:
+        attributes = [getattr(value, name, None) for name in _slot_names(type(value))]
+        attributes.extend(getattr(value, "__dict__", {}).values())
+        items = [
+            item
+            for item in attributes
+            if isinstance(item, SCALAR_TYPES + CONTAINER_TYPES)
+        ]
+
+    return size + sum(payload_sizeof(item, _depth + 1) for item in items)
+
+
+class CacheEntry:
+    __slots__ = ("value", "expires_at", "size")
+
+    def __init__(self, value: Any, expires_at: float, size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+
+
+# Bounded key/value store with a TTL per entry. Entries are kept in recency
+# order, the least recently used is evicted once max_entries or max_bytes is
+# passed. Expired entries are dropped when read and by sweep(). Sizes come from
+# sizeof, payload_sizeof by default, so max_bytes is an estimate, not exact
+class LRUCache:
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        max_entries: int,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = payload_sizeof,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _remove(self, key: Hashable) -> CacheEntry:
+        entry = self.entries.pop(key)
+        self.bytes -= entry.size
+        return entry
+
+    # Returns the cached value, or None if missing or expired
+    def get(self, key: Hashable) -> Any:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.expired += 1
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        if key in self.entries:
+            self._remove(key)
+
+        size = self.sizeof(value) + ENTRY_OVERHEAD
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self.entries[key] = CacheEntry(value, expires_at, size)
+        self.bytes += size
+
+        while self.entries and (
+            len(self.entries) > self.max_entries
+            or (self.max_bytes is not None and self.bytes > self.max_bytes)
+        ):
+            self._remove(next(iter(self.entries)))
+            self.evictions += 1
+
+    # Updates an entry only if it is already cached, restarting its TTL
+    def replace(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> bool:
+        if key not in self.entries:
+            return False
+        self.set(key, value, ttl)
+        return True
+
+    def pop(self, key: Hashable) -> Any:
+        if key not in self.entries:
+            return None
+        return self._remove(key).value
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    # Drops every expired entry, returns how many were removed
+    def sweep(self) -> int:
+        now = time.monotonic()
+        expired = [
+            key for key, entry in self.entries.items() if entry.expires_at <= now
+        ]
+        for key in expired:
+            self._remove(key)
+        self.expired += len(expired)
+        return len(expired)
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "expired": self.expired,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,99 @@
+import os
+import re
+from collections import deque
+from typing import Dict, List
+
+from utils.logger import *
+
+SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", 500))
+SAMPLE_SIZE = 1000  # latencies kept per fingerprint for percentiles
+
+# Literal patterns stripped from statements to build a fingerprint
+STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+VALUE_LIST = re.compile(r"\((?:\s*(?:\?|%s)\s*,)+\s*(?:\?|%s)\s*\)")
+WHITESPACE = re.compile(r"\s+")
+
+
+# Normalises a statement so calls that differ only by their values share one
+# fingerprint, e.g. "WHERE guildID = 123" and "WHERE guildID = %s" both become
+# "WHERE guildID = ?"
+def fingerprint(query: str) -> str:
+    query = STRING_LITERAL.sub("?", query)
+    query = NUMBER_LITERAL.sub("?", query)
+    query = query.replace("%s", "?")
+    query = VALUE_LIST.sub("(?, ...)", query)
+    return WHITESPACE.sub(" ", query).strip()
+
+
+class QueryStat:
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0  # seconds
+        self.rows = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.samples = deque(maxlen=SAMPLE_SIZE)
+
+    def percentile(self, pct: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class QueryStats:
+    def __init__(self, slow_query_ms: float = SLOW_QUERY_MS):
+        self.slow_query_ms = slow_query_ms
+        self.stats: Dict[str, QueryStat] = {}
+
+    # Records one execution of query, logging it if it crossed the slow threshold
+    def record(
+        self,
+        query: str,
+        elapsed: float,
+        rows: int = 0,
+        timed_out: bool = False,
+        failed: bool = False,
+    ):
+        key = fingerprint(query)
+        stat = self.stats.get(key)
+        if stat is None:
+            stat = self.stats[key] = QueryStat()
+
+        stat.count += 1
+        stat.total_time += elapsed
+        stat.rows += max(rows, 0)
+        stat.samples.append(elapsed)
+        if timed_out:
+            stat.timeouts += 1
+        elif failed:
+            stat.errors += 1
+
+        elapsed_ms = elapsed * 1000
+        if elapsed_ms >= self.slow_query_ms:
+            logger.warning(f"Slow query ({elapsed_ms:.0f}ms, {rows} rows): {key}")
+
+    # Returns the n fingerprints with the most total DB time
+    def top(self, n: int = 10) -> List[dict]:
+        ranked = sorted(
+            self.stats.items(), key=lambda item: item[1].total_time, reverse=True
+        )
+        return [
+            {
+                "query": key,
+                "count": stat.count,
+                "total_ms": stat.total_time * 1000,
+                "p50_ms": stat.percentile(50) * 1000,
+                "p95_ms": stat.percentile(95) * 1000,
+                "p99_ms": stat.percentile(99) * 1000,
+                "rows": stat.rows,
+                "timeouts": stat.timeouts,
+                "errors": stat.errors,
+            }
+            for key, stat in ranked[:n]
+        ]
+
+    def reset(self):
+        self.stats.clear()
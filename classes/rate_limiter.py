@@ -1,50 +1,331 @@
 import asyncio
+import os
+import random
 import time
-from collections import deque
-from typing import Any, Awaitable, Callable, Dict
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 
+import aiohttp
 import discord
+from redis.exceptions import RedisError
 
+from classes.cooldown_store import CooldownStore
+from classes.redis_limiter import RedisCooldowns, RedisTokenBucket
 from utils.logger import *
 
+# "memory" keeps limits per process, "redis" shares the global rate and user
+# cooldowns between every process using the same Redis
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
 
+# Priority lanes for queued calls, highest first, and their share of dispatches
+# when every lane has work waiting
+LANE_WEIGHTS = {
+    "relay": 8,  # user-facing DM <-> ticket relay
+    "receipt": 4,  # staff-facing receipts and notices
+    "mirror": 2,  # thread log mirrors
+    "cosmetic": 1,  # edits, deletes, reactions
+}
+QUEUE_SLOTS = 10  # requests in flight at once across all lanes
+
+# Retries of failed calls, capped per window so an outage cannot multiply load
+RETRY_BUDGET = int(os.getenv("RETRY_BUDGET", 30))
+RETRY_WINDOW = 60.0  # seconds
+BACKOFF_BASE = 1.0  # seconds, doubled per attempt before jitter
+BACKOFF_MAX = 30.0
+TRANSIENT_STATUSES = (429, 500, 502, 503, 504)
+
+# Lane override for calls made inside Queue.lane(...)
+current_lane: ContextVar[Optional[str]] = ContextVar("current_lane", default=None)
+
+# Seconds between sweeps of learned bucket state whose window has reset. Ticket
+# channels come and go, so per-channel state would otherwise pile up
+BUCKET_SWEEP_INTERVAL = 60.0
+
+# Path segments whose following ID is the route's major parameter
+MAJOR_RESOURCES = ("channels", "guilds", "webhooks")
+
+# Path segments followed by an ID and then a per-request token, the token is
+# templated so every interaction and webhook shares one route key
+TOKEN_RESOURCES = ("webhooks", "interactions")
+
+MAX_BUCKET_HASHES = 1000  # route keys remembered, least recently seen dropped
+
+# Discord REST route each patched call type hits, normalised the same way as
+# observed response paths so learned bucket state lines up with queued calls
+ROUTE_TEMPLATES = {
+    "message_send": "POST /channels/{major}/messages",
+    "message_edit": "PATCH /channels/{major}/messages/{id}",
+    "message_delete": "DELETE /channels/{major}/messages/{id}",
+    "fetch_message": "GET /channels/{major}/messages/{id}",
+    "add_reaction": "PUT /channels/{major}/messages/{id}/reactions/{emoji}/@me",
+    "followup_send": "POST /webhooks/{major}/{token}",
+}
+
+
+# Turns a request path into (route key, major parameter), e.g.
+# "/api/v10/channels/123/messages/456" -> ("PATCH /channels/{major}/messages/{id}", 123)
+# "/interactions/1/aW50/callback" -> ("POST /interactions/{id}/{token}/callback", None)
+def normalise_route(method: str, path: str) -> Tuple[str, Optional[int]]:
+    segments = path.split("/")
+    if len(segments) > 2 and segments[1] == "api":
+        segments = [""] + segments[3:]
+
+    major = None
+    template = []
+    previous = ""
+    for segment in segments:
+        if major is None and previous in MAJOR_RESOURCES and segment.isdigit():
+            major = int(segment)
+            template.append("{major}")
+        elif (
+            len(template) >= 2
+            and template[-2] in TOKEN_RESOURCES
+            and template[-1] in ("{major}", "{id}")
+        ):
+            template.append("{token}")
+        elif previous == "reactions":
+            template.append("{emoji}")
+        elif segment.isdigit():
+            template.append("{id}")
+        else:
+            template.append(segment)
+        previous = segment
+
+    return f"{method.upper()} {'/'.join(template)}", major
+
+
+# Rate limit state Discord reported for one bucket + major parameter
+class DiscordBucket:
+    def __init__(self):
+        self.limit = None
+        self.remaining = None
+        self.reset_after = 0.0
+        self.reset_at = 0.0  # monotonic
+
+
+# Token bucket that grants tokens at `rate` per second up to `capacity`. Waiters
+# are woken FIFO by a single timer scheduled for the exact moment the next token
+# is available, so nothing polls while the bucket is empty
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.waiters = deque()
+        self.timer = None
+        self.wakeups = 0  # timer callbacks fired, for metrics
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _schedule(self):
+        if self.timer is not None or not self.waiters:
+            return
+        delay = max(0.0, (1 - self.tokens) / self.rate)
+        self.timer = asyncio.get_running_loop().call_later(delay, self._wake)
+
+    def _wake(self):
+        self.timer = None
+        self.wakeups += 1
+        self._refill()
+        while self.waiters and self.tokens >= 1:
+            future = self.waiters.popleft()
+            if future.done():  # cancelled while waiting
+                continue
+            self.tokens -= 1
+            future.set_result(None)
+        self._schedule()
+
+    async def acquire(self):
+        self._refill()
+        if not self.waiters and self.tokens >= 1:
+            self.tokens -= 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.append(future)
+        self._schedule()
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Granted just before the cancel landed, hand the token back
+            if future.done() and not future.cancelled():
+                self.tokens += 1
+                self._wake()
+            raise
+
+
+# Hands out a fixed number of dispatch slots across priority lanes using smooth
+# weighted round robin, so busy low-priority lanes still progress but never
+# hold up higher ones for long. Waiters within a lane are FIFO
+class LaneScheduler:
+    def __init__(self, weights: Dict[str, int], slots: int):
+        self.weights = weights
+        self.available = slots
+        self.lanes = {lane: deque() for lane in weights}
+        self.credit = {lane: 0 for lane in weights}
+        self.dispatched = {lane: 0 for lane in weights}
+        self.max_wait = {lane: 0.0 for lane in weights}
+
+    def _pick(self) -> Optional[str]:
+        ready = [lane for lane, waiters in self.lanes.items() if waiters]
+        if not ready:
+            return None
+
+        total = sum(self.weights[lane] for lane in ready)
+        for lane in ready:
+            self.credit[lane] += self.weights[lane]
+        best = max(ready, key=self.credit.get)
+        self.credit[best] -= total
+        return best
+
+    def _dispatch(self):
+        while self.available > 0:
+            lane = self._pick()
+            if lane is None:
+                return
+            future = self.lanes[lane].popleft()
+            if future.done():  # cancelled while waiting
+                continue
+            self.available -= 1
+            future.set_result(None)
+
+    def _release(self):
+        self.available += 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, lane: str):
+        if self.available > 0 and not any(self.lanes.values()):
+            self.available -= 1
+        else:
+            start = time.monotonic()
+            future = asyncio.get_running_loop().create_future()
+            self.lanes[lane].append(future)
+            self._dispatch()  # slots may be free behind cancelled waiters
+            try:
+                await future
+            except asyncio.CancelledError:
+                # Granted just before the cancel landed, pass the slot on
+                if future.done() and not future.cancelled():
+                    self._release()
+                raise
+            waited = time.monotonic() - start
+            self.max_wait[lane] = max(self.max_wait[lane], waited)
+
+        self.dispatched[lane] += 1
+        try:
+            yield
+        finally:
+            self._release()
+
+    def get_metrics(self) -> Dict[str, dict]:
+        return {
+            lane: {
+                "depth": len(self.lanes[lane]),
+                "dispatched": self.dispatched[lane],
+                "max_wait": self.max_wait[lane],
+            }
+            for lane in self.weights
+        }
+
+
+# An edit or delete waiting for dispatch that later calls for the same message
+# fold into, they all resolve with its result
+class PendingMessageCall:
+    def __init__(self, kwargs: dict):
+        self.kwargs = dict(kwargs)
+        self.future = asyncio.get_running_loop().create_future()
+        self.dropped = False  # superseded by a delete before dispatch
+
+
+# Sliding window count of retries, spend() refuses once the window is used up
+class RetryBudget:
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self.spent = deque()  # monotonic time of each retry
+
+    def spend(self) -> bool:
+        now = time.monotonic()
+        while self.spent and now - self.spent[0] > self.window:
+            self.spent.popleft()
+        if len(self.spent) >= self.limit:
+            return False
+        self.spent.append(now)
+        return True
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.limit - len(self.spent))
+
+
+# Concurrency limit for one route type. Its slots are handed out by lane, so a
+# relay queued behind a backlog of mirrors on the same route goes next
 class RateLimitBucket:
-    def __init__(self, delay: float, max_concurrency: int = 10):
-        self.delay = delay
-        self.lock = asyncio.Lock()
-        self.reset_time = 0.0
-        self.semaphore = asyncio.Semaphore(max_concurrency)
+    def __init__(self, max_concurrency: int = 10):
+        self.slots = LaneScheduler(LANE_WEIGHTS, max_concurrency)
 
 
 class Queue:
     def __init__(self, max_actions_per_sec: int = 50):
         self.route_buckets: Dict[str, RateLimitBucket] = {}
-        self.global_lock = asyncio.Lock()
-        self.global_reset = 0.0
-        self.call_timestamps = deque()
+        self.global_reset = 0.0  # monotonic, set only by a global 429
         self.max_actions_per_sec = max_actions_per_sec
-        self.user_action_cooldowns = {
-            "open_ticket_button": {},  # {user_id: timestamp}
-            "dm_start": {},  # {user_id: timestamp}
-        }
+        self.local_bucket = TokenBucket(max_actions_per_sec)
+        self.global_bucket = self.local_bucket
+        self.shared_cooldowns: Optional[RedisCooldowns] = None
+        self.scheduler = LaneScheduler(LANE_WEIGHTS, QUEUE_SLOTS)
         self.per_user_cooldown_seconds = {
             "open_ticket_button": 5,  # seconds
             "dm_start": 3,
         }
+        self.user_action_cooldowns: Dict[str, CooldownStore] = {
+            route: CooldownStore(seconds)
+            for route, seconds in self.per_user_cooldown_seconds.items()
+        }
+
+        # Concurrency per route type, pacing comes from Discord's own bucket
+        # headers learned in observe_response
+        self.route_concurrency = {
+            "dm_send": 1,
+            "message_send": 2,
+            "message_delete": 1,
+            "message_edit": 5,
+            "channel_edit": 5,
+            "add_reaction": 5,
+            "fetch_message": 5,
+            "fetch_member": 5,
+            "fetch_user": 5,
+            "fetch_generic": 5,
+            "generic": 5,
+        }
+
+        # Route key -> Discord bucket, in least recently seen order
+        self.bucket_hashes: "OrderedDict[str, str]" = OrderedDict()
+        self.discord_buckets: Dict[Tuple[str, int], DiscordBucket] = {}
+        self.buckets_swept_at = time.monotonic()
+        self.buckets_evicted = 0
 
-        # Customize delays and concurrency per route type
-        self.route_delays = {
-            "dm_send": (1, 1),
-            "message_send": (0.1, 2),
-            "message_delete": (0.6, 1),
-            "message_edit": (0.5, 5),
-            "channel_edit": (0.5, 5),
-            "add_reaction": (0.5, 5),
-            "fetch_message": (1, 5),
-            "fetch_member": (1, 5),
-            "fetch_user": (1, 5),
-            "fetch_generic": (1, 5),
-            "generic": (1, 5),
+        # Queued message edits/deletes by message ID, and calls elided by them
+        self.pending_edits: Dict[int, PendingMessageCall] = {}
+        self.pending_deletes: Dict[int, PendingMessageCall] = {}
+        self.elided = {"message_edit": 0, "message_delete": 0}
+
+        # Backoff after failures, per Discord bucket and major parameter
+        self.backoff_until: Dict[Tuple[str, Optional[int]], float] = {}
+        self.retry_budget = RetryBudget(RETRY_BUDGET, RETRY_WINDOW)
+        self.retry_metrics = {
+            "retries": {},  # {status: count}
+            "global_pauses": 0,
+            "bucket_backoffs": 0,
+            "paused_seconds": 0.0,
+            "budget_exhausted": 0,
         }
 
     def _classify_route(self, func: Callable, *args, **kwargs) -> str:
@@ -71,96 +352,423 @@ class Queue:
 
     def _get_bucket(self, route: str) -> RateLimitBucket:
         if route not in self.route_buckets:
-            delay, concurrency = self.route_delays.get(route, (0.5, 5))
-            self.route_buckets[route] = RateLimitBucket(delay, concurrency)
+            concurrency = self.route_concurrency.get(route, 5)
+            self.route_buckets[route] = RateLimitBucket(concurrency)
         return self.route_buckets[route]
 
-    async def _enforce_global_rate(self):
-        now = time.time()
-        while len(self.call_timestamps) >= self.max_actions_per_sec:
-            if now - self.call_timestamps[0] > 1:
-                self.call_timestamps.popleft()
-            else:
-                await asyncio.sleep(0.01)
-                now = time.time()
-        self.call_timestamps.append(now)
+    # Default lane for a call when the caller has not picked one with lane()
+    def _classify_lane(self, route: str, target) -> str:
+        if route in ("message_edit", "message_delete", "add_reaction"):
+            return "cosmetic"
+        if route == "followup_send":
+            return "relay"
+        if isinstance(target, discord.Thread):
+            return "mirror"
+        if isinstance(target, (discord.DMChannel, discord.User, discord.Member)):
+            return "relay"
+        return "receipt"
+
+    # Runs the calls made inside this block in the given lane
+    @contextmanager
+    def lane(self, name: str):
+        token = current_lane.set(name)
+        try:
+            yield
+        finally:
+            current_lane.reset(token)
+
+    # Returns per-lane queue depth, dispatch counts and worst wait (seconds)
+    def get_lane_metrics(self) -> Dict[str, dict]:
+        return self.scheduler.get_metrics()
+
+    # Returns the ID Discord rate limits this call's target under (its channel,
+    # or the webhook), None when it cannot be known before the request
+    def _major_parameter(self, target) -> Optional[int]:
+        if isinstance(target, discord.Webhook):
+            return target.id
+        if isinstance(target, (discord.User, discord.Member)):
+            return target.dm_channel.id if target.dm_channel else None
+
+        channel = getattr(target, "channel", None)
+        if channel is not None and getattr(channel, "id", None) is not None:
+            return channel.id
+        return getattr(target, "id", None)
+
+    # Records the bucket state Discord returned for a request
+    def observe_response(self, method: str, path: str, headers):
+        bucket_hash = headers.get("X-RateLimit-Bucket")
+        if bucket_hash is None:
+            return
+
+        now = time.monotonic()
+        if now - self.buckets_swept_at >= BUCKET_SWEEP_INTERVAL:
+            self._sweep_discord_buckets(now)
+
+        route_key, major = normalise_route(method, path)
+        self.bucket_hashes[route_key] = bucket_hash
+        self.bucket_hashes.move_to_end(route_key)
+        if len(self.bucket_hashes) > MAX_BUCKET_HASHES:
+            self.bucket_hashes.popitem(last=False)
+        state = self.discord_buckets.setdefault((bucket_hash, major), DiscordBucket())
+        try:
+            state.limit = int(headers.get("X-RateLimit-Limit", 1))
+            state.remaining = int(headers.get("X-RateLimit-Remaining", 0))
+            state.reset_after = float(headers.get("X-RateLimit-Reset-After", 0))
+            state.reset_at = time.monotonic() + state.reset_after
+
+        except ValueError:
+            logger.warning(f"Malformed rate limit headers for {route_key}")
+
+    # Drops bucket state whose window has reset, it would be refilled on next
+    # use anyway, so a bucket with no recent traffic is the same as unlearned
+    def _sweep_discord_buckets(self, now: float):
+        expired = [
+            key for key, state in self.discord_buckets.items() if state.reset_at <= now
+        ]
+        for key in expired:
+            del self.discord_buckets[key]
+        self.buckets_evicted += len(expired)
+        self.buckets_swept_at = now
+
+    # Returns how many buckets are tracked and how many were dropped as stale
+    def get_bucket_metrics(self) -> Dict[str, int]:
+        return {
+            "tracked": len(self.discord_buckets),
+            "evicted": self.buckets_evicted,
+        }
+
+    # aiohttp trace hook feeding every Discord REST response into observe_response,
+    # passed to the bot as http_trace
+    def create_trace_config(self) -> aiohttp.TraceConfig:
+        async def on_request_end(session, context, params):
+            self.observe_response(
+                params.method, params.url.path, params.response.headers
+            )
+
+        trace = aiohttp.TraceConfig()
+        trace.on_request_end.append(on_request_end)
+        return trace
+
+    # Returns the learned state of Discord's bucket for this route and target,
+    # None while it is unlearned
+    def _discord_bucket(self, route: str, target) -> Optional[DiscordBucket]:
+        template = ROUTE_TEMPLATES.get(route)
+        bucket_hash = self.bucket_hashes.get(template) if template else None
+        if bucket_hash is None:
+            return None
+
+        state = self.discord_buckets.get((bucket_hash, self._major_parameter(target)))
+        if state is None or state.remaining is None:
+            return None
+        return state
+
+    # Seconds until the bucket has a request left, 0 if it has one now
+    def _discord_bucket_delay(self, state: Optional[DiscordBucket]) -> float:
+        if state is None or state.remaining > 0:
+            return 0.0
+
+        delay = state.reset_at - time.monotonic()
+        if delay <= 0:
+            # Window rolled over before a response refreshed it
+            state.remaining = state.limit
+            state.reset_at = time.monotonic() + state.reset_after
+            return 0.0
+        return delay
+
+    # Waits until Discord's bucket for this route and target has a request
+    # left, without reserving it. Unlearned buckets pass straight through
+    async def _wait_for_discord_bucket(self, route: str, target):
+        while True:
+            delay = self._discord_bucket_delay(self._discord_bucket(route, target))
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    # Holds one of the route's slots for a call, handed out in lane order.
+    # Backoff and Discord's bucket are waited out before taking it, so a call
+    # that has to sleep never keeps other channels on the route waiting, and
+    # checked again once it is held since the calls ahead may have used the
+    # window up. Reserves the request from Discord's bucket before handing the
+    # slot over
+    @asynccontextmanager
+    async def _route_slot(
+        self,
+        bucket: RateLimitBucket,
+        lane: str,
+        route: str,
+        target,
+        backoff_key: Tuple[str, Optional[int]],
+    ):
+        while True:
+            await self._wait_for_backoff(backoff_key)
+            await self._wait_for_discord_bucket(route, target)
+            async with bucket.slots.slot(lane):
+                state = self._discord_bucket(route, target)
+                if (
+                    self._backoff_delay(backoff_key) > 0
+                    or self._discord_bucket_delay(state) > 0
+                ):
+                    continue
+
+                if state is not None:
+                    state.remaining -= 1
+                yield
+                return
 
     async def call(
         self, func: Callable[..., Awaitable], *args, route_type: str = None, **kwargs
     ) -> Any:
         route = route_type or self._classify_route(func, *args, **kwargs)
-        bucket = self._get_bucket(route)
+        target = args[0] if args else None
+
+        # Only plain keyword edits and immediate deletes can be merged
+        if len(args) == 1 and getattr(target, "id", None) is not None:
+            if route == "message_edit":
+                return await self._coalesce_edit(func, target, kwargs)
+            if route == "message_delete" and kwargs.get("delay") is None:
+                return await self._coalesce_delete(func, target, kwargs)
+
+        return await self._dispatch(route, func, args, kwargs)
+
+    # Folds an edit into one already queued for the same message (later values
+    # win), and drops it outright if the message is queued for deletion
+    async def _coalesce_edit(self, func: Callable, message, kwargs: dict) -> Any:
+        message_id = message.id
+        if message_id in self.pending_deletes:
+            self.elided["message_edit"] += 1
+            return None
+
+        pending = self.pending_edits.get(message_id)
+        if pending is not None:
+            pending.kwargs.update(kwargs)
+            self.elided["message_edit"] += 1
+            return await asyncio.shield(pending.future)
+
+        pending = self.pending_edits[message_id] = PendingMessageCall(kwargs)
+
+        # Once the request goes out later edits must queue a fresh one
+        def on_dispatch() -> bool:
+            if self.pending_edits.get(message_id) is pending:
+                del self.pending_edits[message_id]
+            return not pending.dropped
+
+        result = None
+        try:
+            result = await self._dispatch(
+                "message_edit", func, (message,), pending.kwargs, on_dispatch
+            )
+            return result
+        finally:
+            on_dispatch()
+            if not pending.future.done():
+                pending.future.set_result(result)
+
+    # Shares one request between deletes of the same message and drops any edit
+    # still waiting for it
+    async def _coalesce_delete(self, func: Callable, message, kwargs: dict) -> Any:
+        message_id = message.id
+        pending = self.pending_deletes.get(message_id)
+        if pending is not None:
+            self.elided["message_delete"] += 1
+            return await asyncio.shield(pending.future)
 
-        async with bucket.semaphore:
-            now = time.time()
+        pending = self.pending_deletes[message_id] = PendingMessageCall(kwargs)
+        edit = self.pending_edits.pop(message_id, None)
+        if edit is not None:
+            edit.dropped = True
+            self.elided["message_edit"] += 1
+            edit.future.set_result(None)
 
-            async with self.global_lock:
-                if now < self.global_reset:
-                    await asyncio.sleep(self.global_reset - now)
+        result = None
+        try:
+            result = await self._dispatch(
+                "message_delete", func, (message,), pending.kwargs
+            )
+            return result
+        finally:
+            # Held until the request finishes so edits racing it are dropped too
+            del self.pending_deletes[message_id]
+            if not pending.future.done():
+                pending.future.set_result(result)
 
-            async with bucket.lock:
-                if time.time() < bucket.reset_time:
-                    await asyncio.sleep(bucket.reset_time - time.time())
-                await self._enforce_global_rate()
+    # Returns counts of edits/deletes that never reached Discord
+    def get_elided_metrics(self) -> Dict[str, int]:
+        return dict(self.elided)
+
+    # Runs one call through its route's slots, rate limits and lane scheduler.
+    # on_dispatch runs just before the first request and may cancel it
+    async def _dispatch(
+        self,
+        route: str,
+        func: Callable[..., Awaitable],
+        args: tuple,
+        kwargs: dict,
+        on_dispatch: Optional[Callable[[], bool]] = None,
+    ) -> Any:
+        bucket = self._get_bucket(route)
+        target = args[0] if args else None
+        lane = current_lane.get() or self._classify_lane(route, target)
+        backoff_key = self._backoff_key(route, target)
+
+        for attempt in range(3):  # give yourself 3 shots total
+            # Backoff and Discord's bucket are waited out before a route slot
+            # is taken, then a global token is waited for while holding it
+            async with self._route_slot(bucket, lane, route, target, backoff_key):
+                await self.global_bucket.acquire()
+
+                # A lane slot is only held for the request itself, calls still
+                # waiting on their route or a backoff never starve other lanes
+                async with self.scheduler.slot(lane):
+                    if attempt == 0 and on_dispatch is not None and not on_dispatch():
+                        return None
 
-                for attempt in range(3):  # give yourself 3 shots total
                     try:
-                        result = await func(*args, **kwargs)
-                        bucket.reset_time = time.time() + bucket.delay
-                        return result
+                        return await func(*args, **kwargs)
 
                     except discord.HTTPException as e:
                         # Explicitly catch known Discord transient errors
-                        if e.status in (429, 500, 502, 503, 504):
-                            retry_after = getattr(e, "retry_after", 1.0)
-                            sleep_time = (
-                                retry_after if e.status == 429 else (2**attempt)
-                            )
-                            self.global_reset = time.time() + sleep_time
+                        if e.status not in TRANSIENT_STATUSES or attempt == 2:
+                            break
+                        if not self.retry_budget.spend():
+                            self.retry_metrics["budget_exhausted"] += 1
                             logger.warning(
-                                f"Discord HTTP {e.status}, retrying after {sleep_time:.1f}s"
+                                f"Discord HTTP {e.status} on {route}, "
+                                f"retry budget spent"
                             )
-                            await asyncio.sleep(sleep_time)
-                            continue
-                        else:
-                            # logger.error(f"Execution failed (not retrying): {e}")
                             break
+                        self._back_off(e, attempt, backoff_key, route)
 
                     except Exception as e:
                         logger.error(f"Non HTTP exception: {e}")
                         break
 
-    def check_user_action_cooldown(
-        self, route: str, user_id: int
-    ) -> tuple[bool, float, bool]:
-        """
-        Check and update per-user action cooldowns.
-        Returns (is_rate_limited, retry_after_seconds, was_notified)
-        """
-        now = time.time()
+    # Backoff is tracked per Discord bucket once it has been learned, otherwise
+    # per route, and always per channel/webhook within it
+    def _backoff_key(self, route: str, target) -> Tuple[str, Optional[int]]:
+        template = ROUTE_TEMPLATES.get(route)
+        bucket_hash = self.bucket_hashes.get(template, route)
+        return bucket_hash, self._major_parameter(target)
+
+    # Seconds left of any global pause or backoff on this key, 0 once over
+    def _backoff_delay(self, key: Tuple[str, Optional[int]]) -> float:
+        until = max(self.global_reset, self.backoff_until.get(key, 0.0))
+        delay = until - time.monotonic()
+        if delay <= 0:
+            self.backoff_until.pop(key, None)
+            return 0.0
+        return delay
+
+    async def _wait_for_backoff(self, key: Tuple[str, Optional[int]]):
+        while True:
+            delay = self._backoff_delay(key)
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    # Schedules the retry of a failed call. Only a global 429 pauses every
+    # route, a bucket 429 waits out its retry_after and 5xx errors back off
+    # exponentially with full jitter on their own bucket
+    def _back_off(
+        self,
+        error: discord.HTTPException,
+        attempt: int,
+        key: Tuple[str, Optional[int]],
+        route: str,
+    ):
+        retries = self.retry_metrics["retries"]
+        retries[error.status] = retries.get(error.status, 0) + 1
+        headers = getattr(error.response, "headers", None) or {}
+
+        if error.status == 429:
+            try:
+                delay = float(
+                    getattr(error, "retry_after", None)
+                    or headers.get("Retry-After", 1.0)
+                )
+            except ValueError:
+                delay = 1.0
+        else:
+            delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))
+
+        until = time.monotonic() + delay
+        self.retry_metrics["paused_seconds"] += delay
+        if error.status == 429 and (
+            headers.get("X-RateLimit-Global") == "true"
+            or headers.get("X-RateLimit-Scope") == "global"
+        ):
+            self.global_reset = max(self.global_reset, until)
+            self.retry_metrics["global_pauses"] += 1
+            scope = "all routes"
+        else:
+            self.backoff_until[key] = max(self.backoff_until.get(key, 0.0), until)
+            self.retry_metrics["bucket_backoffs"] += 1
+            scope = route
 
-        cooldowns = self.user_action_cooldowns.setdefault(route, {})
-        attempts = cooldowns.setdefault("attempts", {})
-        timestamps = cooldowns.setdefault("timestamps", {})
-        notified = cooldowns.setdefault("notified", {})
+        logger.warning(
+            f"Discord HTTP {error.status}, retrying {scope} after {delay:.1f}s"
+        )
 
-        last_time = timestamps.get(user_id, 0)
-        attempt_count = attempts.get(user_id, 0)
-        was_notified = notified.get(user_id, False)
+    # Returns retry counts by status, pauses taken and the budget left
+    def get_retry_metrics(self) -> dict:
+        metrics = dict(self.retry_metrics)
+        metrics["retries"] = dict(self.retry_metrics["retries"])
+        metrics["budget_remaining"] = self.retry_budget.remaining
+        return metrics
 
-        # Calculate retry after using exponential backoff
-        base_delay = self.per_user_cooldown_seconds.get(route, 3)
-        retry_after = (last_time + base_delay * (2 ** max(0, attempt_count - 1))) - now
+    # Switches the global rate and user cooldowns to the Redis backend when it is
+    # configured, called after every (re)connect to Redis. Local state stays as
+    # fallback, always the in-memory bucket so reconnects never stack wrappers
+    def use_backend(self, redis):
+        if RATE_LIMIT_BACKEND != "redis":
+            return
+        if redis is None:
+            logger.warning("Redis rate limit backend unavailable, using memory")
+            self.global_bucket = self.local_bucket
+            self.shared_cooldowns = None
+            return
+        if (
+            isinstance(self.global_bucket, RedisTokenBucket)
+            and self.global_bucket.redis is redis
+        ):
+            return
 
-        if retry_after > 0:
-            return True, retry_after, was_notified
+        self.global_bucket = RedisTokenBucket(
+            redis, "ratelimit:global", self.max_actions_per_sec, self.local_bucket
+        )
+        self.shared_cooldowns = RedisCooldowns(redis)
+        logger.success("Rate limits shared through Redis")
 
-        # Reset attempt count if cooldown expired
-        if now - last_time > base_delay * 4:
-            attempt_count = 0
+    def _cooldown_store(self, route: str) -> CooldownStore:
+        store = self.user_action_cooldowns.get(route)
+        if store is None:
+            base_delay = self.per_user_cooldown_seconds.get(route, 3)
+            store = self.user_action_cooldowns[route] = CooldownStore(base_delay)
+        return store
 
-        attempts[user_id] = attempt_count + 1
-        timestamps[user_id] = now
-        notified[user_id] = False  # reset notification status
+    async def check_user_action_cooldown(
+        self, route: str, user_id: int
+    ) -> tuple[bool, float, bool]:
+        """
+        Check and update per-user action cooldowns.
+        Returns (is_rate_limited, retry_after_seconds, was_notified)
+        """
+        store = self._cooldown_store(route)
+        if self.shared_cooldowns is not None:
+            try:
+                return await self.shared_cooldowns.check(
+                    route, user_id, store.base_delay
+                )
+            except (RedisError, OSError) as e:
+                logger.warning(f"Shared cooldown check failed, using local: {e}")
+        return store.check(user_id)
 
-        return False, 0.0, False
+    # Records that the user was told about their cooldown, so repeat attempts
+    # within it are ignored silently
+    async def mark_user_notified(self, route: str, user_id: int):
+        if self.shared_cooldowns is not None:
+            try:
+                await self.shared_cooldowns.mark_notified(route, user_id)
+                return
+            except (RedisError, OSError) as e:
+                logger.warning(f"Shared cooldown update failed, using local: {e}")
+        self._cooldown_store(route).mark_notified(user_id)
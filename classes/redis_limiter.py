@@ -0,0 +1,119 @@
+import asyncio
+from typing import Tuple
+
+from redis.exceptions import RedisError
+
+from classes.cooldown_store import RESET_AFTER
+from utils.logger import *
+
+# Reserves one token from a bucket shared by every process (KEYS[1]) and returns
+# how long the caller must wait for it. Tokens may go negative, which queues
+# callers behind each other instead of having them poll. Uses the server clock
+# so processes on different hosts agree on time
+TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate) - 1
+redis.call('HSET', KEYS[1], 'tokens', string.format('%.6f', tokens),
+    'ts', string.format('%.6f', now))
+local backlog = math.max(0, -tokens) / rate
+redis.call('PEXPIRE', KEYS[1], math.ceil((backlog + capacity / rate) * 1000) + 1000)
+return string.format('%.6f', backlog)
+"""
+
+# Same exponential backoff as CooldownStore.check for one user (KEYS[1]).
+# Returns {limited, retry_after, notified}, the key expires with its window
+COOLDOWN_LUA = """
+local base = tonumber(ARGV[1])
+local reset_after = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'attempts', 'last', 'notified')
+local attempts = tonumber(state[1])
+local last = tonumber(state[2])
+if attempts and last then
+    local retry = last + base * 2 ^ math.max(0, attempts - 1) - now
+    if retry > 0 then
+        return {1, string.format('%.6f', retry), state[3] or '0'}
+    end
+    if now - last > base * reset_after then
+        attempts = 1
+    else
+        attempts = attempts + 1
+    end
+else
+    attempts = 1
+end
+redis.call('HSET', KEYS[1], 'attempts', attempts,
+    'last', string.format('%.6f', now), 'notified', 0)
+local window = base * math.max(reset_after, 2 ^ (attempts - 1))
+redis.call('PEXPIRE', KEYS[1], math.ceil(window * 1000))
+return {0, '0', '0'}
+"""
+
+# Flags a live cooldown as notified, HSET keeps the key's TTL
+MARK_NOTIFIED_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('HSET', KEYS[1], 'notified', 1)
+end
+return 0
+"""
+
+
+# Shared global token bucket, falls back to the process-local bucket while
+# Redis is unreachable so calls keep flowing at the local rate
+class RedisTokenBucket:
+    def __init__(self, redis, key: str, rate: float, fallback, capacity=None):
+        self.redis = redis
+        self.key = key
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.fallback = fallback
+        self.script = redis.register_script(TOKEN_BUCKET_LUA)
+        self.healthy = True
+        self.fallbacks = 0
+
+    async def acquire(self):
+        try:
+            wait = await self.script(keys=[self.key], args=[self.rate, self.capacity])
+        except (RedisError, OSError) as e:
+            self.fallbacks += 1
+            if self.healthy:
+                self.healthy = False
+                logger.warning(f"Shared rate limit unavailable, using local: {e}")
+            await self.fallback.acquire()
+            return
+
+        if not self.healthy:
+            self.healthy = True
+            logger.success("Shared rate limit restored")
+        if float(wait) > 0:
+            await asyncio.sleep(float(wait))
+
+
+# Per-user action cooldowns shared by every process, keyed
+# cooldown:{route}:{user_id}. Callers fall back to the local stores on error
+class RedisCooldowns:
+    def __init__(self, redis, prefix: str = "cooldown"):
+        self.prefix = prefix
+        self.check_script = redis.register_script(COOLDOWN_LUA)
+        self.notify_script = redis.register_script(MARK_NOTIFIED_LUA)
+
+    def _key(self, route: str, user_id: int) -> str:
+        return f"{self.prefix}:{route}:{user_id}"
+
+    async def check(
+        self, route: str, user_id: int, base_delay: float
+    ) -> Tuple[bool, float, bool]:
+        limited, retry_after, notified = await self.check_script(
+            keys=[self._key(route, user_id)], args=[base_delay, RESET_AFTER]
+        )
+        return bool(int(limited)), float(retry_after), notified == "1"
+
+    async def mark_notified(self, route: str, user_id: int):
+        await self.notify_script(keys=[self._key(route, user_id)])
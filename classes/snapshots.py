@@ -0,0 +1,111 @@
+from datetime import datetime
+from typing import Optional, Tuple
+
+import discord
+
+
+# Slim stand-in for a discord.User holding only what embeds and DMs read. It
+# keeps the connection state, like discord.py objects do, so it can still find
+# or open the user's DM channel
+class UserSnapshot:
+    __slots__ = ("id", "name", "avatar_url", "_display_avatar_url", "_state")
+
+    def __init__(
+        self,
+        id: int,
+        name: str,
+        avatar_url: Optional[str],
+        display_avatar_url: str,
+        state,
+    ):
+        self.id = id
+        self.name = name
+        self.avatar_url = avatar_url  # the user's own avatar, None if unset
+        # Usually the same URL as avatar_url, only kept when it differs
+        self._display_avatar_url = (
+            None if display_avatar_url == avatar_url else display_avatar_url
+        )
+        self._state = state
+
+    @classmethod
+    def from_user(cls, user: discord.abc.User) -> "UserSnapshot":
+        return cls(
+            user.id,
+            user.name,
+            user.avatar.url if user.avatar else None,
+            user.display_avatar.url,
+            user._state,
+        )
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} id={self.id} name={self.name!r}>"
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+    @property
+    def created_at(self) -> datetime:
+        return discord.utils.snowflake_time(self.id)
+
+    @property
+    def display_avatar_url(self) -> str:
+        return self._display_avatar_url or self.avatar_url
+
+    @property
+    def icon_url(self) -> str:
+        return self.avatar_url or self._display_avatar_url
+
+    @property
+    def dm_channel(self) -> Optional[discord.DMChannel]:
+        return self._state._get_private_channel_by_user(self.id)
+
+    # Same as discord.User.create_dm
+    async def create_dm(self) -> discord.DMChannel:
+        found = self.dm_channel
+        if found is not None:
+            return found
+        data = await self._state.http.start_private_message(self.id)
+        return self._state.add_dm_channel(data)
+
+
+class MemberSnapshot(UserSnapshot):
+    __slots__ = ("guild_id", "role_ids", "joined_at")
+
+    def __init__(
+        self,
+        id: int,
+        name: str,
+        avatar_url: Optional[str],
+        display_avatar_url: str,
+        state,
+        guild_id: int,
+        role_ids: Tuple[int, ...],
+        joined_at: Optional[datetime],
+    ):
+        super().__init__(id, name, avatar_url, display_avatar_url, state)
+        self.guild_id = guild_id
+        self.role_ids = role_ids  # excludes @everyone
+        self.joined_at = joined_at
+
+    @classmethod
+    def from_member(cls, member: discord.Member) -> "MemberSnapshot":
+        return cls(
+            member.id,
+            member.name,
+            member.avatar.url if member.avatar else None,
+            member.display_avatar.url,
+            member._state,
+            member.guild.id,
+            tuple(member._roles),
+            member.joined_at,
+        )
+
+
+# Returns a snapshot of a user or member, passing snapshots and None through
+def snapshot(obj):
+    if obj is None or isinstance(obj, UserSnapshot):
+        return obj
+    if isinstance(obj, discord.Member):
+        return MemberSnapshot.from_member(obj)
+    return UserSnapshot.from_user(obj)
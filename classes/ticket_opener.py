@@ -307,12 +307,7 @@ class TicketOpener:
         ticket_embed.timestamp = datetime.now(timezone.utc)
         name = f"{user.name} | {user.id}"
         if member is not None:
-            ticket_embed.set_footer(
-                text=name,
-                icon_url=(
-                    (member.avatar and member.avatar.url) or member.display_avatar.url
-                ),
-            )
+            ticket_embed.set_footer(text=name, icon_url=member.icon_url)
         else:
             ticket_embed.set_footer(
                 text=name, icon_url=((user.avatar and user.avatar.url) or None)
@@ -323,17 +318,12 @@ class TicketOpener:
         ticket_embed.add_field(name="Opener ID", value=user.id, inline=True)
         # Member-specific info
         if member is not None:
-            roles = member.roles
-            default = guild.default_role
+            role_ids = member.role_ids
             formatted_roles = "*None*"
-            if len(roles) > 1:
-                formatted_roles = " ".join(
-                    [f"<@&{role.id}>" for role in roles if role != default]
-                )
+            if role_ids:
+                formatted_roles = " ".join([f"<@&{role_id}>" for role_id in role_ids])
                 if len(formatted_roles) > 1024:
-                    formatted_roles = (
-                        f"*{len([role for role in roles if role != default])} roles*"
-                    )
+                    formatted_roles = f"*{len(role_ids)} roles*"
             ticket_embed.add_field(name="Roles", value=formatted_roles, inline=True)
             ticket_embed.add_field(name="", value="", inline=False)
             ticket_embed.add_field(
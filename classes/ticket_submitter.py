@@ -301,14 +301,16 @@ class DMCategoryButtonView(discord.ui.View):
             user = interaction.user
             guild = interaction.guild
             limited, retry_after, was_notified = (
-                self.bot.queue.check_user_action_cooldown("open_ticket_button", user.id)
+                await self.bot.queue.check_user_action_cooldown(
+                    "open_ticket_button", user.id
+                )
             )
 
             if limited:
                 if not was_notified:
-                    self.bot.queue.user_action_cooldowns["open_ticket_button"][
-                        "notified"
-                    ][user.id] = True
+                    await self.bot.queue.mark_user_notified(
+                        "open_ticket_button", user.id
+                    )
                     error_embed.description = f"❌ You're clicking a bit too quickly — please wait {retry_after:.1f} seconds."
                     await interaction.followup.send(embed=error_embed, ephemeral=True)
                 # else: silently ignore
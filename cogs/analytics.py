@@ -9,6 +9,7 @@ import discord
 from discord.ext import commands
 
 from classes.error_handler import *
+from classes.snapshots import snapshot
 from classes.ticket_submitter import TicketSelectView
 from roblox_data.helpers import *
 from utils import emojis
@@ -285,7 +286,9 @@ class Analytics(commands.Cog):
                 for data, filename in raw_files
             ]
             try:
-                await server_channel.send(embed=send_embed, files=files)
+                # User's message relayed into the ticket, same lane as DM relays
+                with self.bot.queue.lane("relay"):
+                    await server_channel.send(embed=send_embed, files=files)
             except Exception:
                 error_embed.description = (
                     "❌ Failed to send message to server. Please try again."
@@ -517,10 +520,9 @@ class Analytics(commands.Cog):
             )
 
             if member:
+                member = snapshot(member)
                 receipt_embed.set_footer(
-                    text=f"{member.name} | {member.id}",
-                    icon_url=(member.avatar and member.avatar.url)
-                    or member.display_avatar.url,
+                    text=f"{member.name} | {member.id}", icon_url=member.icon_url
                 )
             files = [
                 discord.File(io.BytesIO(data), filename=filename)
@@ -974,15 +976,17 @@ class Analytics(commands.Cog):
             return
 
         if isinstance(message.channel, discord.DMChannel):
-            limited, retry, was_notified = self.bot.queue.check_user_action_cooldown(
-                "dm_start", message.author.id
+            limited, retry, was_notified = (
+                await self.bot.queue.check_user_action_cooldown(
+                    "dm_start", message.author.id
+                )
             )
 
             if limited:
                 if not was_notified:
-                    self.bot.queue.user_action_cooldowns["dm_start"]["notified"][
-                        message.author.id
-                    ] = True
+                    await self.bot.queue.mark_user_notified(
+                        "dm_start", message.author.id
+                    )
                     error_embed = discord.Embed(
                         description=f"❌ You're messaging me too quickly — retry in {retry:.1f} seconds.",
                         color=discord.Color.red(),
@@ -102,9 +102,38 @@ class Events(commands.Cog):
     #                         # modmail cat isnt full yet
     #                         return
 
+    # CACHE system, member and user events are only delivered with the members
+    # intent, without it those entries fall back to their TTL
+    # Forget a remembered "not a member" for someone who just joined
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        await self.bot.cache.invalidate_member(member.guild.id, member.id)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        await self.bot.cache.remove_member(member.guild.id, member.id)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before, after):
+        await self.bot.cache.update_member(after)
+
+    @commands.Cog.listener()
+    async def on_user_update(self, before, after):
+        await self.bot.cache.update_user(after)
+
+    @commands.Cog.listener()
+    async def on_thread_update(self, before, after):
+        await self.bot.cache.update_channel(after)
+
+    @commands.Cog.listener()
+    async def on_thread_delete(self, thread):
+        await self.bot.cache.remove_channel(thread.id)
+
     # Catch deleted overflow categories
     @commands.Cog.listener()
     async def on_guild_channel_delete(self, channel):
+        await self.bot.cache.remove_channel(channel.id)
+
         if isinstance(channel, discord.TextChannel):
             if channel.id in self.bot.channel_status.last_update_times:
                 del self.bot.channel_status.last_update_times[
@@ -140,6 +169,8 @@ class Events(commands.Cog):
     # TYPING system
     @commands.Cog.listener()
     async def on_guild_channel_update(self, before, after):
+        await self.bot.cache.update_channel(after)
+
         if isinstance(before, discord.TextChannel):
 
             if before.category_id != after.category_id:
@@ -10,6 +10,7 @@ from discord import app_commands
 from discord.ext import commands
 
 from classes.error_handler import *
+from classes.snapshots import snapshot
 from classes.ticket_submitter import DMCategoryButtonView, TicketRatingView
 from utils import checks, emojis, queries
 from utils.logger import *
@@ -22,6 +23,7 @@ async def close_ticket(
         deleted = False
         mod_id = -1
         mod_name = "Unknown"
+        mod = snapshot(mod)
         if mod:
             mod_id = mod.id
             mod_name = mod.name
@@ -38,9 +40,17 @@ async def close_ticket(
             except Exception:
                 pass
             try:
-                await bot.data_manager.close_ticket(ticket_channel.id, mod_id, mod_name)
-                await bot.data_manager.delete_user_ticket(user_id, guild_id)
-                await bot.data_manager.clear_channel_links(ticket_channel.id)
+                # DB close + closing times, the Redis cleanup only once the
+                # ticket is closed in the DB
+                duration_mins, response_mins = (
+                    await bot.data_manager.close_ticket_bundle(
+                        ticket_channel.id, mod_id, mod_name
+                    )
+                )
+                await asyncio.gather(
+                    bot.data_manager.delete_user_ticket(user_id, guild_id),
+                    bot.data_manager.clear_channel_links(ticket_channel.id),
+                )
                 await bot.channel_status.set_emoji(ticket_channel, None)
             except Exception:
                 errorEmbed = discord.Embed(
@@ -57,8 +67,11 @@ async def close_ticket(
             guild = ticket_channel.guild
             id_list = (ticket_channel.topic).split()
             thread_id = id_list[-1]
-            opener = None
-            config = await bot.data_manager.get_or_load_config(guild.id)
+            config, thread, opener = await asyncio.gather(
+                bot.data_manager.get_or_load_config(guild.id),
+                bot.cache.get_channel(thread_id),
+                bot.cache.get_guild_member(guild, user_id),
+            )
 
             if anon is None:
                 if config["anon"] == "true":
@@ -68,32 +81,27 @@ async def close_ticket(
 
             closing = config["closing"]
             log_id = config["log_id"]
-            log_channel = await bot.cache.get_channel(log_id)
-            thread = await bot.cache.get_channel(thread_id)
-            opener = await bot.cache.get_guild_member(guild, user_id)
+            use_ap = anon and config["aps"] == "true"
+            log_channel, ap = await asyncio.gather(
+                bot.cache.get_channel(log_id),
+                (
+                    bot.data_manager.get_or_load_ap(guild.id, mod_id)
+                    if use_ap
+                    else asyncio.sleep(0, result=None)
+                ),
+            )
 
             closeLogEmbed = discord.Embed(
                 title=f"Ticket Closed", description=reason, color=discord.Color.red()
             )
             closeLogEmbed.timestamp = datetime.now(timezone.utc)
 
-            await bot.data_manager.flush_messages_v2()
-            query = queries.closing_queries(ticket_channel.id)
-            try:
-                result = await bot.data_manager.execute_query(query)
-            except Exception:
-                result = []
-
-            if len(result) > 0:
-                data = result[0]
-                if data[0] is None:
-                    duration = "N/A"
-                else:
-                    duration = queries.format_time(data[0])
-                if data[1] is None:
-                    response = "N/A"
-                else:
-                    response = queries.format_time(data[1])
+            duration = "N/A"
+            response = "N/A"
+            if duration_mins is not None:
+                duration = queries.format_time(duration_mins)
+            if response_mins is not None:
+                response = queries.format_time(response_mins)
 
             closeLogEmbed.add_field(name="Logs", value=f"<#{thread.id}>", inline=False)
             closeLogEmbed.add_field(name="Ticket Duration", value=duration, inline=True)
@@ -102,15 +110,10 @@ async def close_ticket(
             )
 
             name = f"{mod_name} | {mod_id}"
-            url = (mod.avatar and mod.avatar.url) or mod.display_avatar.url
-            ap = None
+            url = mod.icon_url
             if anon:
-                if config["aps"] == "true":
-                    ap = await bot.data_manager.get_or_load_ap(guild.id, mod_id)
-                    if ap is not None:
-                        name += " (Anonymous Profile)"
-                    else:
-                        name = f"{name} (Anonymous)"
+                if ap is not None:
+                    name += " (Anonymous Profile)"
                 else:
                     name = f"{name} (Anonymous)"
             closeLogEmbed.set_author(name=name, icon_url=url)
@@ -121,8 +124,7 @@ async def close_ticket(
             if opener:
                 closeLogEmbed.set_footer(
                     text=f"{opener.name} | {opener.id}",
-                    icon_url=(opener.avatar and opener.avatar.url)
-                    or opener.display_avatar.url,
+                    icon_url=opener.icon_url,
                 )
 
                 dm_channel = opener.dm_channel or await opener.create_dm()
@@ -185,8 +187,9 @@ async def send_closing(
     bot, guild, dm_channel, channel_id, mod, opener, closing_text, reason, anon, ap
 ):
     try:
+        mod = snapshot(mod)
         name = f"{mod.name} | {mod.id}"
-        url = (mod.avatar and mod.avatar.url) or mod.display_avatar.url
+        url = mod.icon_url
         closeUserEmbed = discord.Embed(
             title=f"Ticket Closed", description=reason, color=discord.Color.red()
         )
@@ -1077,7 +1080,6 @@ class Tickets(commands.Cog):
                             await self.bot.channel_status.add_timer(
                                 channel_id, end_time, author.id, user_id, reason
                             )
-                            await self.bot.data_manager.save_timers_to_redis()
 
                             await channel.send(embed=statusEmbed)
                             return
@@ -1120,7 +1122,6 @@ class Tickets(commands.Cog):
                             await channel.send(embed=errorEmbed)
                             return
                         else:
-                            await self.bot.data_manager.save_timers_to_redis()
                             successEmbed = discord.Embed(
                                 title="",
                                 description=f"Removed **inactive** timer, status set to **waiting**",
@@ -176,6 +176,92 @@ class Util(commands.Cog):
         await self.bot.data_manager.flush_messages()
         await ctx.send("Emptied messages cache")
 
+    # Displays flush counts and lock wait times per message table
+    @commands.command()
+    @checks.is_owner()
+    async def flush_stats(self, ctx):
+        message = "**Flush metrics**\n"
+        for table, metrics in self.bot.data_manager.get_flush_metrics().items():
+            message += (
+                f"`{table}` flushes: {metrics['flushes']}, "
+                f"lock wait avg: {metrics['lock_wait_avg'] * 1000:.1f} ms, "
+                f"max: {metrics['lock_wait_max'] * 1000:.1f} ms\n"
+            )
+        await ctx.send(f"{emojis.mantis} {message}")
+
+    # Displays the queries with the most total DB time
+    @commands.command()
+    @checks.is_owner()
+    async def query_stats(self, ctx, count: int = 5):
+        top = self.bot.data_manager.query_stats.top(count)
+        if not top:
+            await ctx.send(f"{emojis.mantis} No queries recorded yet")
+            return
+
+        message = "**Top queries by total time**\n"
+        for entry in top:
+            message += (
+                f"`{entry['query'][:150]}`\n"
+                f"> {entry['count']} calls, total {entry['total_ms']:.0f} ms, "
+                f"p50 {entry['p50_ms']:.1f} / p95 {entry['p95_ms']:.1f} / "
+                f"p99 {entry['p99_ms']:.1f} ms, {entry['rows']} rows, "
+                f"{entry['timeouts']} timeouts\n"
+            )
+        await ctx.send(f"{emojis.mantis} {message[:1900]}")
+
+    # Displays size, hit rate, evictions and fetches saved per object cache
+    @commands.command()
+    @checks.is_owner()
+    async def cache_stats(self, ctx):
+        message = "**Object caches**\n"
+        for name, stats in self.bot.cache.get_stats().items():
+            message += (
+                f"`{name}` entries: {stats['entries']}, "
+                f"size: {stats['bytes'] / 1024:.0f} KiB, "
+                f"hits: {stats['hits']}, misses: {stats['misses']} "
+                f"({stats['hit_rate']:.0%}), evicted: {stats['evictions']}, "
+                f"expired: {stats['expired']}, coalesced: {stats['coalesced']}, "
+                f"saved by misses: {stats['negative_hits']}, "
+                f"event updates: {stats['event_updates']}, "
+                f"string IDs: {stats['normalised']}, "
+                f"from Redis: {stats['l2_hits']}\n"
+            )
+        await ctx.send(f"{emojis.mantis} {message}")
+
+    # Displays queue depth and dispatch counts per priority lane, how many
+    # edits/deletes were coalesced away, and retries and pauses taken
+    @commands.command()
+    @checks.is_owner()
+    async def queue_stats(self, ctx):
+        message = "**Queue lanes**\n"
+        for lane, metrics in self.bot.queue.get_lane_metrics().items():
+            message += (
+                f"`{lane}` depth: {metrics['depth']}, "
+                f"dispatched: {metrics['dispatched']}, "
+                f"max wait: {metrics['max_wait'] * 1000:.0f} ms\n"
+            )
+        elided = self.bot.queue.get_elided_metrics()
+        message += (
+            f"**Elided** edits: {elided['message_edit']}, "
+            f"deletes: {elided['message_delete']}\n"
+        )
+        retry = self.bot.queue.get_retry_metrics()
+        statuses = ", ".join(f"{k}: {v}" for k, v in retry["retries"].items())
+        message += (
+            f"**Retries** {statuses or 'none'}, "
+            f"budget left: {retry['budget_remaining']}, "
+            f"exhausted: {retry['budget_exhausted']}\n"
+            f"**Pauses** global: {retry['global_pauses']}, "
+            f"bucket: {retry['bucket_backoffs']}, "
+            f"total: {retry['paused_seconds']:.1f}s\n"
+        )
+        buckets = self.bot.queue.get_bucket_metrics()
+        message += (
+            f"**Buckets** tracked: {buckets['tracked']}, "
+            f"evicted: {buckets['evicted']}\n"
+        )
+        await ctx.send(f"{emojis.mantis} {message}")
+
     # Example error
     @commands.command()
     async def error(self, ctx):
@@ -45,22 +45,28 @@ class MailBee(commands.Bot):
         intents.guilds = True
         intents.dm_messages = True
         intents.message_content = True
+        # Privileged, must also be enabled in the developer portal. Lets member
+        # events keep the member cache fresh instead of refetching on a TTL
+        intents.members = os.getenv("MEMBERS_INTENT", "false").lower() == "true"
         description = "MailBee: A ticketing and analytics system for Discord"
+        queue = Queue()
 
-        # Create bot instance with command prefix
+        # Create bot instance with command prefix, the queue learns Discord's
+        # rate limit buckets from every HTTP response via the trace hook
         super().__init__(
             command_prefix=commands.when_mentioned_or("+"),
             intents=intents,
             description=description,
             case_insensitive=True,
             help_command=None,
+            http_trace=queue.create_trace_config(),
         )
         self.data_manager = DataManager(self)
         self.channel_status = ChannelStatus(self)
         self.helper = Helper(self)
         self.cache = Cache(self)
         self.opener = TicketOpener(self)
-        self.queue = Queue()
+        self.queue = queue
 
         self.heartbeat = tasks.loop(minutes=10)(self._heartbeat)
 
@@ -141,6 +147,7 @@ class MailBee(commands.Bot):
 
         if self.data_manager.db_pool:
             await self.data_manager.data_startup()
+            self.queue.use_backend(self.data_manager.redis)
 
     async def _load_cogs(self) -> None:
         for filename in os.listdir("./cogs"):
@@ -174,6 +181,14 @@ class MailBee(commands.Bot):
             await self._quit(e)
             return
 
+        try:
+            await self.cache.warm_up()
+        except Exception as e:
+            logger.warning(f"Cache warm-up skipped: {e}")
+
+        if not self.heartbeat.is_running():
+            self.heartbeat.start()
+
         logger.log("SYSTEM", "------- ADDING PERSISTENT VIEWS ----------")
         self.add_view(DMCategoryButtonView(self))
         self.add_view(TicketRatingView(self))
@@ -189,7 +204,36 @@ class MailBee(commands.Bot):
 
     async def _heartbeat(self):
         await self.data_manager.save_status_dicts_to_redis()
-        await self.data_manager.save_timers_to_redis()
+
+        pool = self.data_manager.get_pool_metrics()
+        if pool:
+            buckets = ", ".join(
+                f"<={bound}ms: {count}"
+                for bound, count in pool["acquire_buckets"].items()
+                if count
+            )
+            logger.info(
+                f"DB pool {pool['in_use']}/{pool['size']} in use "
+                f"(peak {pool['in_use_peak']}, max {pool['maxsize']}), "
+                f"{pool['acquires']} acquires, "
+                f"max wait {pool['acquire_wait_max']:.1f}ms [{buckets}]"
+            )
+
+        swept = self.cache.sweep()
+        for name, stats in self.cache.get_stats().items():
+            logger.info(
+                f"Cache {name}: {stats['entries']} entries, "
+                f"{stats['bytes'] / 1024:.0f} KiB, hit rate {stats['hit_rate']:.0%}, "
+                f"{stats['evictions']} evicted, {stats['expired']} expired"
+            )
+        logger.info(f"Cache sweep dropped {swept} expired entries")
+
+        await self.data_manager.probe_db()
+        breaker = self.data_manager.db_breaker.get_metrics()
+        logger.info(
+            f"DB circuit {breaker['state']}, {breaker['rejected']} rejected, "
+            f"transitions {breaker['transitions']}"
+        )
 
         status = await self.data_manager.check_db_health()
         if not status:
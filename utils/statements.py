@@ -0,0 +1,525 @@
+from typing import Dict, NamedTuple
+
+# Registry of every fixed SQL statement DataManager runs. Each statement is
+# defined once with %s placeholders and executed with bound parameters, so the
+# statement text is identical on every call and values are never interpolated
+# into SQL by hand.
+#
+# aiomysql has no server-side prepared statement support (COM_STMT_PREPARE),
+# parameters are escaped and bound client-side by the driver.
+
+
+class Statement(NamedTuple):
+    name: str
+    sql: str
+    fetch: bool = True
+
+
+STATEMENTS: Dict[str, Statement] = {}
+
+
+# Adds a statement to the registry, whitespace is collapsed so the stored text
+# is canonical
+def register(name: str, sql: str, fetch: bool = True) -> Statement:
+    if name in STATEMENTS:
+        raise ValueError(f"Statement '{name}' is already registered")
+
+    statement = Statement(name, " ".join(sql.split()), fetch)
+    STATEMENTS[name] = statement
+    return statement
+
+
+# ---------------------------------------------------------------------------
+# Cache loaders
+# ---------------------------------------------------------------------------
+
+LOAD_ACCESS_ROLES = register("load_access_roles", "SELECT * FROM permissions;")
+
+LOAD_MONITORED_CHANNELS = register(
+    "load_monitored_channels", "SELECT * FROM channel_monitor;"
+)
+
+# ---------------------------------------------------------------------------
+# Config
+# ---------------------------------------------------------------------------
+
+LOAD_CONFIG = register(
+    "load_config",
+    """
+    SELECT * FROM config
+    WHERE guildID = %s;
+    """,
+)
+
+ADD_CONFIG = register(
+    "add_config",
+    """
+    INSERT INTO config (guildID, logID, inboxID, responsesID, feedbackID, reportID)
+    VALUES (%s, %s, %s, %s, %s, %s);
+    """,
+    False,
+)
+
+SET_TICKET_LOG = register(
+    "set_ticket_log", "UPDATE config SET logID = %s WHERE guildID = %s;", False
+)
+
+SET_TICKET_INBOX = register(
+    "set_ticket_inbox", "UPDATE config SET inboxID = %s WHERE guildID = %s;", False
+)
+
+SET_TICKET_RESPONSES = register(
+    "set_ticket_responses",
+    "UPDATE config SET responsesID = %s WHERE guildID = %s;",
+    False,
+)
+
+SET_FEEDBACK_THREAD = register(
+    "set_feedback_thread",
+    "UPDATE config SET feedbackID = %s WHERE guildID = %s;",
+    False,
+)
+
+SET_REPORT_THREAD = register(
+    "set_report_thread", "UPDATE config SET reportID = %s WHERE guildID = %s;", False
+)
+
+SET_ANON_STATUS = register(
+    "set_anon_status", "UPDATE config SET anon = %s WHERE guildID = %s;", False
+)
+
+SET_TICKET_ACCEPTING = register(
+    "set_ticket_accepting",
+    "UPDATE config SET accepting = %s WHERE guildID = %s;",
+    False,
+)
+
+SET_GREETING = register(
+    "set_greeting", "UPDATE config SET greeting = %s WHERE guildID = %s;", False
+)
+
+SET_CLOSING = register(
+    "set_closing", "UPDATE config SET closing = %s WHERE guildID = %s;", False
+)
+
+# ---------------------------------------------------------------------------
+# Tickets
+# ---------------------------------------------------------------------------
+
+LOAD_OPEN_TICKETS = register(
+    "load_open_tickets",
+    """
+    SELECT guildID, channelID
+    FROM tickets_v2
+    WHERE openerID = %s
+    AND state = 'open';
+    """,
+)
+
+# Everything Discord-side an open ticket touches, preloaded into the cache
+LIST_OPEN_TICKET_LINKS = register(
+    "list_open_ticket_links",
+    """
+    SELECT guildID, channelID, logID, openerID
+    FROM tickets_v2
+    WHERE state = 'open';
+    """,
+)
+
+GET_GUILD_AND_LOG = register(
+    "get_guild_and_log",
+    """
+    SELECT guildID, logID
+    FROM tickets_v2
+    WHERE channelID = %s;
+    """,
+)
+
+GET_TICKET_HISTORY = register(
+    "get_ticket_history",
+    """
+    SELECT ticketID, logID, dateOpen, dateClose, closerID, state, typeName
+    FROM tickets_v2 INNER JOIN ticket_types ON tickets_v2.type = ticket_types.typeID
+    WHERE tickets_v2.guildID = %s
+    AND tickets_v2.openerID = %s
+    ORDER BY dateOpen Desc;
+    """,
+)
+
+GET_TICKET_COUNT = register(
+    "get_ticket_count",
+    """
+    SELECT COUNT(ticketID)
+    FROM tickets_v2
+    WHERE tickets_v2.guildID = %s
+    AND tickets_v2.openerID = %s;
+    """,
+)
+
+CHECK_ID_EXISTS = register(
+    "check_id_exists",
+    """
+    SELECT openerID
+    FROM tickets_v2
+    WHERE tickets_v2.ticketID = %s
+    AND tickets_v2.guildID = %s;
+    """,
+)
+
+GET_TICKET_ID = register(
+    "get_ticket_id",
+    """
+    SELECT ticketID
+    FROM tickets_v2
+    WHERE tickets_v2.channelID = %s;
+    """,
+)
+
+CREATE_TICKET = register(
+    "create_ticket",
+    """
+    INSERT IGNORE INTO tickets_v2 (guildID, ticketID, channelID, logID,
+    dateOpen, openerID, state, type, time, robux, hours, queue)
+    VALUES (%s, %s, %s, %s, %s, %s, 'open', %s, %s, %s, %s, %s);
+    """,
+    False,
+)
+
+CLOSE_TICKET = register(
+    "close_ticket",
+    """
+    UPDATE tickets_v2
+    SET dateClose = %s,
+        closerID = %s,
+        closerUN = %s,
+        state = 'closed'
+    WHERE channelID = %s;
+    """,
+    False,
+)
+
+# Ticket duration and first response time in minutes, read right after the
+# ticket is closed
+CLOSING_TIMES = register(
+    "closing_times",
+    """
+    SELECT
+    (SELECT (TIMESTAMPDIFF(MINUTE, tickets_v2.dateOpen, tickets_v2.dateClose))
+        FROM tickets_v2
+        WHERE tickets_v2.channelID = %s),
+
+    (SELECT (TIMESTAMPDIFF(MINUTE, tickets_v2.dateOpen, first_message.date))
+        FROM tickets_v2
+        INNER JOIN (
+            SELECT ticket_messages_v2.channelID, MIN(date) AS date
+            FROM ticket_messages_v2
+            WHERE type = 'Sent'
+            GROUP BY ticket_messages_v2.channelID
+        ) AS first_message
+        ON tickets_v2.channelID = first_message.channelID
+        WHERE tickets_v2.channelID = %s);
+    """,
+)
+
+UPDATE_RATING = register(
+    "update_rating",
+    "UPDATE tickets_v2 SET rating = %s WHERE channelID = %s;",
+    False,
+)
+
+# ---------------------------------------------------------------------------
+# Anonymous profiles
+# ---------------------------------------------------------------------------
+
+LOAD_ADJS = register("load_adjs", "SELECT * FROM ap_adjs;")
+
+LOAD_NOUNS = register(
+    "load_nouns",
+    """
+    SELECT ap_nouns.nounID, ap_nouns.noun FROM
+    ap_nouns WHERE ap_nouns.guildID = %s;
+    """,
+)
+
+LOAD_LINKS = register(
+    "load_links",
+    """
+    SELECT ap_links.modID, ap_links.nounID, ap_links.adjID FROM
+    ap_links WHERE ap_links.guildID = %s;
+    """,
+)
+
+LOAD_AP = register(
+    "load_ap",
+    """
+    SELECT ap_adjs.adj, ap_nouns.noun, ap_nouns.nounURL, ap_links.date FROM
+    ap_links JOIN ap_adjs ON ap_links.adjID = ap_adjs.adjID
+    JOIN ap_nouns ON ap_links.nounID = ap_nouns.nounID
+    WHERE ap_links.guildID = %s
+    AND ap_nouns.guildID = %s
+    AND ap_links.modID = %s
+    ORDER BY ap_links.date DESC
+    LIMIT 1;
+    """,
+)
+
+# ---------------------------------------------------------------------------
+# Verified users
+# ---------------------------------------------------------------------------
+
+GET_VERIFIED_USER = register(
+    "get_verified_user", "SELECT token FROM verified_users WHERE userID = %s;"
+)
+
+ADD_VERIFIED_USER = register(
+    "add_verified_user", "INSERT INTO verified_users VALUES (%s, %s);", False
+)
+
+# ---------------------------------------------------------------------------
+# Blacklist
+# ---------------------------------------------------------------------------
+
+GET_ALL_BLACKLIST = register(
+    "get_all_blacklist", "SELECT * from blacklist WHERE guildID = %s;"
+)
+
+GET_BLACKLIST = register(
+    "get_blacklist",
+    "SELECT userID from blacklist WHERE guildID = %s AND userID = %s;",
+)
+
+ADD_BLACKLIST = register(
+    "add_blacklist",
+    """
+    INSERT INTO blacklist (guildID, userID, reason, modID, modName, date)
+    VALUES (%s, %s, %s, %s, %s, %s);
+    """,
+    False,
+)
+
+DELETE_BLACKLIST = register(
+    "delete_blacklist",
+    "DELETE FROM blacklist WHERE guildID = %s AND userID = %s;",
+    False,
+)
+
+# ---------------------------------------------------------------------------
+# Ticket types
+# ---------------------------------------------------------------------------
+
+GET_TYPES = register(
+    "get_types",
+    """
+    SELECT * FROM ticket_types
+    WHERE guildID = %s
+    ORDER BY typeID ASC;
+    """,
+)
+
+GET_TYPES_V2 = register(
+    "get_types_v2",
+    """
+    SELECT
+        typeID, guildID, categoryID, typeName, subType
+    FROM ticket_types
+    WHERE guildID = %s;
+    """,
+)
+
+ADD_TYPE = register(
+    "add_type",
+    """
+    INSERT INTO ticket_types (guildID, categoryID, typeName, typeDescrip, typeEmoji,
+    formJson, subType)
+    VALUES (%s, %s, %s, %s, %s, %s, %s);
+    """,
+    False,
+)
+
+SET_FORM = register(
+    "set_form",
+    """
+    UPDATE ticket_types
+    SET formJson = %s
+    WHERE guildID = %s AND categoryID = %s;
+    """,
+    False,
+)
+
+DELETE_TYPE = register(
+    "delete_type",
+    "DELETE FROM ticket_types WHERE guildID = %s AND categoryID = %s;",
+    False,
+)
+
+SET_CATEGORY_TYPE = register(
+    "set_category_type",
+    """
+    INSERT INTO category_types
+    VALUES (%s, %s, %s) as matches
+    ON DUPLICATE KEY UPDATE
+    guildID = matches.guildID,
+    categoryID = matches.categoryID,
+    type = matches.type;
+    """,
+    False,
+)
+
+# ---------------------------------------------------------------------------
+# Permissions and monitoring
+# ---------------------------------------------------------------------------
+
+GET_PERMISSIONS = register(
+    "get_permissions",
+    "SELECT roleID, permLevel FROM permissions WHERE guildID = %s;",
+)
+
+ADD_PERMISSION = register(
+    "add_permission", "INSERT INTO permissions VALUES (%s, %s, %s);", False
+)
+
+DELETE_PERMISSION = register(
+    "delete_permission",
+    "DELETE FROM permissions WHERE guildID = %s AND roleID = %s;",
+    False,
+)
+
+ADD_MONITOR = register(
+    "add_monitor", "INSERT INTO channel_monitor VALUES (%s, %s, %s);", False
+)
+
+REMOVE_MONITOR = register(
+    "remove_monitor",
+    "DELETE FROM channel_monitor WHERE channel_monitor.channelID = %s;",
+    False,
+)
+
+# ---------------------------------------------------------------------------
+# Notes and verbals
+# ---------------------------------------------------------------------------
+
+ADD_NOTE = register(
+    "add_note",
+    """
+    INSERT INTO notes (guildID, userID, ticketID, authorID, authorName, date, content)
+    VALUES (%s, %s, %s, %s, %s, %s, %s);
+    """,
+    False,
+)
+
+REMOVE_NOTE = register(
+    "remove_note", "DELETE FROM notes WHERE notes.noteID = %s;", False
+)
+
+GET_USER_NOTES = register(
+    "get_user_notes",
+    "SELECT * FROM notes WHERE notes.guildID = %s AND notes.userID = %s;",
+)
+
+GET_TICKET_NOTES = register(
+    "get_ticket_notes",
+    "SELECT * FROM notes WHERE notes.guildID = %s AND notes.ticketID = %s;",
+)
+
+ADD_VERBAL = register(
+    "add_verbal",
+    """
+    INSERT INTO verbals (messageID, guildID, userID, authorID, authorName, date,
+    content)
+    VALUES (%s, %s, %s, %s, %s, %s, %s);
+    """,
+    False,
+)
+
+REMOVE_VERBAL = register(
+    "remove_verbal", "DELETE FROM verbals WHERE verbals.messageID = %s;", False
+)
+
+EDIT_VERBAL = register(
+    "edit_verbal",
+    """
+    UPDATE verbals
+    SET verbals.authorID = %s,
+    verbals.authorName = %s,
+    verbals.date = %s,
+    verbals.content = %s
+    WHERE verbals.messageID = %s;
+    """,
+    False,
+)
+
+GET_VERBAL = register(
+    "get_verbal", "SELECT * FROM verbals WHERE verbals.messageID = %s;"
+)
+
+GET_VERBAL_HISTORY = register(
+    "get_verbal_history",
+    """
+    SELECT verbals.messageID, verbals.authorID, verbals.authorName, verbals.date,
+    verbals.content
+    FROM verbals WHERE
+    verbals.guildID = %s AND verbals.userID = %s;
+    """,
+)
+
+# ---------------------------------------------------------------------------
+# Snips
+# ---------------------------------------------------------------------------
+
+ADD_SNIP = register(
+    "add_snip",
+    """
+    INSERT INTO snips (guildID, authorID, abbrev, summary, content, date)
+    VALUES (%s, %s, %s, %s, %s, %s);
+    """,
+    False,
+)
+
+REMOVE_SNIP = register(
+    "remove_snip",
+    "DELETE FROM snips WHERE snips.guildID = %s AND snips.abbrev = %s;",
+    False,
+)
+
+GET_SNIP = register(
+    "get_snip",
+    "SELECT snips.content FROM snips WHERE snips.guildID = %s AND snips.abbrev = %s;",
+)
+
+GET_ALL_SNIPS = register(
+    "get_all_snips", "SELECT * FROM snips WHERE snips.guildID = %s;"
+)
+
+# ---------------------------------------------------------------------------
+# Message buffers
+# ---------------------------------------------------------------------------
+
+INSERT_TICKET_MESSAGES = register(
+    "insert_ticket_messages",
+    """
+    INSERT INTO ticket_messages (modmail_messageID, messageID, channelID, authorID,
+    date, type)
+    VALUES (%s, %s, %s, %s, %s, %s) AS messages
+    ON DUPLICATE KEY UPDATE
+        modmail_messageID = messages.modmail_messageID,
+        channelID = messages.channelID,
+        authorID = messages.authorID,
+        date = messages.date,
+        type = messages.type;
+    """,
+    False,
+)
+
+INSERT_TICKET_MESSAGES_V2 = register(
+    "insert_ticket_messages_v2",
+    """
+    INSERT INTO ticket_messages_v2 (channelID, messageID, authorID, date, type)
+    VALUES (%s, %s, %s, %s, %s) AS messages
+    ON DUPLICATE KEY UPDATE
+        channelID = messages.channelID,
+        authorID = messages.authorID,
+        date = messages.date,
+        type = messages.type;
+    """,
+    False,
+)